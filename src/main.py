@@ -20,21 +20,27 @@ The action supports semantic versioning (MAJOR.MINOR.PATCH) and can be configure
 - Manage multiple release branches
 """
 
-import copy
+# All action logic lives in this one module on purpose (the Dockerfile ships only main.py)
+# pylint: disable=too-many-lines
+
 import re
 import os
 import sys
 import logging
+import shutil
 import subprocess
-import requests
-import semver
 import git as real_git
 import datetime
+import functools
 
 from git import GitCommandError
 from pathlib import Path
 
 
+# Keep git from waiting on a credential prompt that nobody can answer in CI.
+_GIT_NON_INTERACTIVE_ENV = {"GIT_TERMINAL_PROMPT": "0"}
+
+
 def git(*args):
     """
     Execute a git command and return its output.
@@ -56,7 +62,11 @@ def git(*args):
             raise TypeError(
                 f"Git command arguments must be strings, got {type(arg)}")
 
-    output = subprocess.check_output(["git"] + list(args)).decode().strip()
+    # Only trailing newlines are dropped: leading blanks are meaningful in
+    # outputs such as 'status --short'
+    output = subprocess.check_output(
+        ["git", *args], text=True, errors="replace",
+        env={**os.environ, **_GIT_NON_INTERACTIVE_ENV}).rstrip('\n')
     logging.info("Git command %s produced output:\n%s\n=======", args, output)
     return output
 
@@ -72,17 +82,20 @@ def git_create_and_push_tag(config, repo, tag, sha="HEAD"):
         sha (str, optional): Commit SHA to tag. Defaults to "HEAD".
 
     Note:
-        The tag will only be pushed if enable_git_push is set to "true" in the config.
+        The tag will only be pushed if enable_git_push is enabled in the config.
     """
     repo.git.tag(tag, sha)
 
-    if config["features"]["enable_git_push"] == "true":
+    if config["features"]["enable_git_push"]:
         repo.git.push('--tags', 'origin', f"refs/tags/{tag}")
         logging.info("Git tag push has been pushed")
     else:
         logging.warning("Git tag push has been skipped due to config flag")
 
 
+_SAFE_VERSION_TABLE = str.maketrans("/", "-")
+
+
 def actions_output(version):
     """
     Set GitHub Actions outputs for version information.
@@ -95,15 +108,29 @@ def actions_output(version):
         - version: The original version string
         - safe_version: A filesystem-safe version of the string
     """
-    safe_version = version.replace("/", "-")
+    safe_version = version.translate(_SAFE_VERSION_TABLE)
 
     logging.debug("Generated version is: %s", version)
     logging.debug("Safe version is: %s", safe_version)
 
-    if os.getenv("GITHUB_OUTPUT"):
-        with open(str(os.getenv("GITHUB_OUTPUT")), mode="a", encoding="utf-8") as env:
-            print(f"version={version}", file=env)
-            print(f"safe_version={safe_version}", file=env)
+    output_path = os.getenv("GITHUB_OUTPUT")
+    if output_path:
+        with open(output_path, mode="a", encoding="utf-8") as env:
+            env.write(f"version={version}\nsafe_version={safe_version}\n")
+
+
+_LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+def _is_true(value):
+    """Interpret a boolean action input ("true", "True", " TRUE ") once."""
+    return (value or "").strip().lower() == "true"
 
 
 def get_config():
@@ -128,39 +155,35 @@ def get_config():
     """
     logging.debug("Building config")
 
-    log_levels = {
-        "debug": logging.DEBUG,
-        "info": logging.INFO,
-        "warning": logging.WARNING,
-        "error": logging.ERROR,
-        "critical": logging.CRITICAL,
-    }
-    log_level = os.environ.get("INPUT_LOG_LEVEL", "INFO")
+    # Snapshot the environment once; all inputs are read from this copy
+    env = os.environ.copy()
+    log_level = env.get("INPUT_LOG_LEVEL", "INFO")
 
     config = {
-        "init_version": os.getenv("INPUT_INIT_VERSION"),
-        "primary_branch": os.getenv("INPUT_PRIMARY_BRANCH"),
+        "init_version": env.get("INPUT_INIT_VERSION"),
+        "primary_branch": env.get("INPUT_PRIMARY_BRANCH"),
         "tag_prefix": {
-            "candidate": os.getenv("INPUT_TAG_PREFIX_CANDIDATE", ""),
-            "release": os.getenv("INPUT_TAG_PREFIX_RELEASE", "")
+            "candidate": env.get("INPUT_TAG_PREFIX_CANDIDATE", ""),
+            "release": env.get("INPUT_TAG_PREFIX_RELEASE", "")
         },
         "git": {
             "name": "gitflow-action",
             "email": "gitflow-action@yandex.com"
         },
         "github": {
-            "repository": os.getenv("GITHUB_REPOSITORY"),
-            "url": os.getenv("INPUT_GITHUB_API_URL", "https://api.github.com"),
-            "token": os.environ.get("INPUT_GITHUB_TOKEN")
+            "repository": env.get("GITHUB_REPOSITORY"),
+            "url": env.get("INPUT_GITHUB_API_URL", "https://api.github.com"),
+            "token": env.get("INPUT_GITHUB_TOKEN")
         },
         "features": {
-            "enable_git_push": os.getenv("INPUT_ENABLE_GIT_PUSH"),
-            "enable_github_release": os.environ.get("INPUT_ENABLE_GITHUB_RELEASE")
+            "enable_git_push": _is_true(env.get("INPUT_ENABLE_GIT_PUSH")),
+            "enable_github_release": _is_true(env.get("INPUT_ENABLE_GITHUB_RELEASE"))
         },
-        "auto_release_branches": os.getenv("INPUT_AUTO_RELEASE_BRANCHES", "").split(","),
-        "log_level": log_levels.get(log_level.lower(), logging.INFO),
+        "auto_release_branches": env.get("INPUT_AUTO_RELEASE_BRANCHES", "").split(","),
+        "log_level": _LOG_LEVELS.get(log_level.lower(), logging.INFO),
         "keywords": {
-            "patch_bump": ['[hotfix]', '[fix]', 'hotfix:', 'fix:'],
+            # Most common conventional-commit prefixes first; the scan stops at the first hit
+            "patch_bump": ['fix:', 'hotfix:', '[fix]', '[hotfix]'],
             "major_bump": ['[BUMP-MAJOR]', 'bump-major', 'feat!'],
             "skip_ci": "[skip ci]"
         },
@@ -169,14 +192,14 @@ def get_config():
         }
     }
 
+    logging.debug("Config has successfully built")
+
     #
-    # This object exist only for debug logs
+    # Masked view exists only for debug logs; only the github section is copied
     #
-    debug_config = copy.deepcopy(config)
-    debug_config["github"]["token"] = "xxx-masked-xxx"
-
-    logging.debug("Config has successfully built")
-    logging.debug(debug_config)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        debug_config = {**config, "github": {**config["github"], "token": "xxx-masked-xxx"}}
+        logging.debug(debug_config)
 
     return config
 
@@ -194,7 +217,39 @@ def validate_config(config):
     logging.info("Config validation passed successfully.")
 
 
-def create_github_release(config, tag, repo, tag_last):
+@functools.lru_cache(maxsize=None)
+def _github_session(token):
+    """
+    Return the process-wide HTTP session used for GitHub API calls with this token.
+
+    The session keeps connections alive between requests, carries the
+    Authorization header, and retries transient gateway errors for idempotent
+    methods only. POST is not retried: a gateway timeout can arrive after GitHub
+    has already created the release, and re-sending it would fail the run with
+    a 422 "already_exists".
+    """
+    # Imported here: only release runs talk to the API, so other runs skip loading requests.
+    import requests  # pylint: disable=import-outside-toplevel
+    from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+    from urllib3.util.retry import Retry  # pylint: disable=import-outside-toplevel
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_github_release(config, tag, repo, tag_last, body=None):
     """
     Create a GitHub release for the specified tag.
 
@@ -203,18 +258,17 @@ def create_github_release(config, tag, repo, tag_last):
         tag (str): Tag name to create a release for.
         repo: GitPython Repo object.
         tag_last (str): The previous tag; only commits since this tag are included in the body.
+        body (str, optional): Prebuilt release notes, e.g. the entry update_changelog
+            just wrote. When omitted, the notes are generated from the commits since tag_last.
 
     Raises:
         requests.exceptions.RequestException: If the GitHub API request fails.
     """
-    commits = get_commits_since_tag(repo, tag_last)
-    groups = group_commits_by_type(commits)
-    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-    repo_url = None
-    gh = config.get("github", {})
-    if gh.get("repository") and gh.get("url"):
-        repo_url = f"{_web_url_from_api_url(gh['url'])}/{gh['repository']}"
-    body = format_changelog_entry(tag, current_date, groups, repo_url)
+    if body is None:
+        commits = get_commits_since_tag(repo, tag_last)
+        groups = group_commits_by_type(commits)
+        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        body = format_changelog_entry(tag, current_date, groups, _repo_web_url(config))
 
     release_data = {
         "name": tag,
@@ -225,22 +279,50 @@ def create_github_release(config, tag, repo, tag_last):
         "generate_release_notes": False
     }
 
-    logging.info(f"Creating GitHub release for {tag} tag")
+    logging.info("Creating GitHub release for %s tag", tag)
 
     url = f"{config['github']['url']}/repos/{config['github']['repository']}/releases"
-    headers = {
-        "Authorization": f"Bearer {config['github']['token']}"
-    }
-    res = requests.post(
-        url, json=release_data, headers=headers, timeout=60
+    res = _github_session(config['github']['token']).post(
+        url, json=release_data, timeout=60
     )
 
     if not res:
         logging.error(
-            f"Failed to create Github release for {tag} tag. Error: {res.text}")
+            "Failed to create Github release for %s tag. Error: %s", tag, res.text)
         res.raise_for_status()
 
 
+@functools.lru_cache(maxsize=32)
+def _lowercase_keywords(keywords):
+    """Lowercase a tuple of keywords once per distinct keyword list."""
+    return tuple(keyword.lower() for keyword in keywords)
+
+
+def _contains_any(text, keywords):
+    """Return True if any keyword is a substring of text (plain loop, no generator frame)."""
+    for keyword in keywords:
+        if keyword in text:
+            return True
+    return False
+
+
+def _keyword_message(message, is_merge=False):
+    """
+    Return the part of a commit message that bump and release keywords are matched against.
+
+    That is the subject line only, so commit bodies quoting "[RELEASE]" or "fix:" don't
+    trigger anything. Merge commits (e.g. GitHub's "Merge pull request #N from ...") keep
+    the PR title on the first body line, so for them that line is matched as well.
+    """
+    lines = [line.strip() for line in message.strip().splitlines()]
+    subject = lines[0] if lines else ""
+    if is_merge:
+        title = next((line for line in lines[1:] if line), None)
+        if title:
+            return f"{subject}\n{title}"
+    return subject
+
+
 def get_bump_type(config, commit_message):
     """
     Determine the type of version bump needed based on commit message.
@@ -255,28 +337,44 @@ def get_bump_type(config, commit_message):
     Note:
         The bump type is determined by checking for keywords in the commit message:
         - major: Keywords from config["keywords"]["major_bump"]
-        - patch: Keywords from config["keywords"]["patch_bump"]
+        - patch: Keywords from config["keywords"]["patch_bump"] (case-insensitive)
         - minor: Default if no other keywords are found
+        Major keywords take precedence, so a breaking change that also mentions a fix is not demoted.
     """
-    result = 'minor'
+    keywords = config["keywords"]
 
-    #
-    # major
-    #
-    if any(keyword in commit_message for keyword in config["keywords"]["major_bump"]):
+    if _contains_any(commit_message, keywords["major_bump"]):
         result = 'major'
-
-    #
-    # patch
-    #
-    if any(keyword.lower() in commit_message.lower() for keyword in config["keywords"]["patch_bump"]):
+    elif _contains_any(commit_message.lower(), _lowercase_keywords(tuple(keywords["patch_bump"]))):
         result = 'patch'
+    else:
+        result = 'minor'
 
     logging.info(
-        f"Based on the commit message '{commit_message}' '{result}' version bump is required")
+        "Based on the commit message '%s' '%s' version bump is required", commit_message, result)
     return result
 
 
+_TAG_PREFIX_RE = re.compile(r'\D+')
+
+
+_SEMVER_CORE_RE = re.compile(r'(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)')
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_semver(version):
+    """Parse a version string once; VersionInfo is immutable so sharing is safe."""
+    # Imported here: runs on custom branches never parse a version, so they skip loading semver.
+    import semver  # pylint: disable=import-outside-toplevel
+
+    # Plain MAJOR.MINOR.PATCH (what this action tags) skips semver's full regex;
+    # anything else, including prerelease/build parts and invalid input, goes to semver
+    core = _SEMVER_CORE_RE.fullmatch(version)
+    if core:
+        return semver.VersionInfo(int(core[1]), int(core[2]), int(core[3]))
+    return semver.VersionInfo.parse(version)
+
+
 def get_semver_version(config, git_tag=None):
     """
     Parse a semantic version from a git tag or return the initial version.
@@ -293,14 +391,15 @@ def get_semver_version(config, git_tag=None):
         Otherwise, strips any prefix from the tag and parses the version.
     """
     if git_tag is None:
-        return semver.VersionInfo.parse(config["init_version"])
+        return _parse_semver(config["init_version"])
 
     #
     # Delete all leading letters and symbols except digits
     #
-    git_tag_without_prefixes = re.sub(r'^[^\d]*', '', git_tag)
+    prefix = _TAG_PREFIX_RE.match(git_tag)
+    git_tag_without_prefixes = git_tag[prefix.end():] if prefix else git_tag
 
-    return semver.VersionInfo.parse(git_tag_without_prefixes)
+    return _parse_semver(git_tag_without_prefixes)
 
 
 def get_new_semver_version(config, tag_last, bump_type):
@@ -341,24 +440,24 @@ def create_release_branch(config, repo, new_version):
 
     Note:
         Creates a branch named 'release/X.Y' where X.Y is the major.minor version.
-        The branch will only be pushed if enable_git_push is set to "true" in the config.
+        The branch will only be pushed if enable_git_push is enabled in the config.
     """
-    branch_version = '.'.join(map(str, new_version[0:2]))
+    branch_version = f"{new_version.major}.{new_version.minor}"
     branch_name = f"release/{branch_version}"
 
     try:
         repo.git.checkout('-b', branch_name)
-        logging.info(f"Release branch {branch_name} successfully created")
+        logging.info("Release branch %s successfully created", branch_name)
 
-        if config["features"]["enable_git_push"] == "true":
+        if config["features"]["enable_git_push"]:
             repo.git.push('-u', 'origin', branch_name)
-            logging.info(f"Release branch {branch_name} successfully pushed")
+            logging.info("Release branch %s successfully pushed", branch_name)
         else:
             logging.warning(
                 "Release branch push has been skipped due to config flag")
     except Exception as ex:
         logging.info(
-            f"Failed to create release branch {branch_name}. Error: {ex}")
+            "Failed to create release branch %s. Error: %s", branch_name, ex)
 
 
 _GIT_TRAILER_RE = re.compile(
@@ -384,6 +483,14 @@ def _linkify_pr_refs(text, repo_url):
     )
 
 
+def _repo_web_url(config):
+    """Return the repository web URL used to linkify PR references, or None."""
+    gh = config.get("github", {})
+    if gh.get("repository") and gh.get("url"):
+        return f"{_web_url_from_api_url(gh['url'])}/{gh['repository']}"
+    return None
+
+
 def _web_url_from_api_url(api_url):
     """Derive the GitHub web base URL from the API URL."""
     if "api.github.com" in api_url:
@@ -392,6 +499,24 @@ def _web_url_from_api_url(api_url):
     return re.sub(r"/api/v3/?$", "", api_url.rstrip("/"))
 
 
+def _log_commits(repo, revision):
+    """
+    List (hexsha, message) pairs for a revision range with a single 'git log'.
+
+    One NUL-separated log is parsed in Python instead of materialising a
+    GitPython Commit object (and a cat-file round trip) per commit.
+    """
+    # '--' keeps git from reading a revision that is also a path (a tag named
+    # like a directory) as a filename
+    output = repo.git.log(revision, '-z', '--format=%H%n%B', '--')
+    commits = []
+    for record in output.split('\0'):
+        hexsha, _, message = record.partition('\n')
+        if hexsha:
+            commits.append((hexsha, message))
+    return commits
+
+
 def get_commits_since_tag(repo, tag):
     """
     Get all commit messages since the specified tag.
@@ -406,16 +531,42 @@ def get_commits_since_tag(repo, tag):
     try:
         commits = []
         revision = f"{tag}..HEAD" if tag else "HEAD"
-        for commit in repo.iter_commits(revision):
-            subject = _extract_subject(commit.message)
+        for hexsha, message in _log_commits(repo, revision):
+            subject = _extract_subject(message)
             if subject:
-                commits.append(f"{commit.hexsha[:7]} {subject}")
+                commits.append(f"{hexsha[:7]} {subject}")
         return commits
     except Exception as e:
-        logging.warning(f"Could not get commits since tag {tag}: {e}")
+        logging.warning("Could not get commits since tag %s: %s", tag, e)
         return []
 
 
+# Changelog sections in output order with their headings
+_CHANGELOG_SECTIONS = (
+    ('feature', 'Features'),
+    ('fix', 'Bug Fixes'),
+    ('chore', 'Chores'),
+    ('docs', 'Documentation'),
+    ('refactor', 'Refactors'),
+    ('perf', 'Performance Improvements'),
+    ('test', 'Tests'),
+    ('misc', 'Miscellaneous'),
+)
+
+
+_COMMIT_TYPE_MAPPING = {
+    'feat': 'feature',
+    'feature': 'feature',
+    'fix': 'fix',
+    'bugfix': 'fix',
+    'chore': 'chore',
+    'docs': 'docs',
+    'refactor': 'refactor',
+    'perf': 'perf',
+    'test': 'test'
+}
+
+
 def group_commits_by_type(commits):
     """
     Group commits by their type (feat, fix, chore, etc.).
@@ -426,64 +577,44 @@ def group_commits_by_type(commits):
     Returns:
         dict: Commits grouped by type.
     """
-    groups = {
-        'feature': [],
-        'fix': [],
-        'chore': [],
-        'docs': [],
-        'refactor': [],
-        'perf': [],
-        'test': [],
-        'misc': []
-    }
-
-    type_mapping = {
-        'feat': 'feature',
-        'feature': 'feature',
-        'fix': 'fix',
-        'bugfix': 'fix',
-        'chore': 'chore',
-        'docs': 'docs',
-        'refactor': 'refactor',
-        'perf': 'perf',
-        'test': 'test'
-    }
+    groups = {key: [] for key, _ in _CHANGELOG_SECTIONS}
+    misc = groups['misc']
+    # Resolve commit types straight to their section lists
+    sections = {commit_type: groups[key] for commit_type, key in _COMMIT_TYPE_MAPPING.items()}
 
     for commit in commits:
         # Format: <hash> <type>(<scope>): <message>
         # or just <hash> <message>
         try:
             # Split hash from message
-            _, message = commit.split(
-                ' ', 1) if ' ' in commit else (None, commit)
+            _, has_hash, message = commit.partition(' ')
+            if not has_hash:
+                message = commit
 
             # Try to extract type from conventional commit format
-            if ':' in message:
-                type_part = message.split(':', 1)[0]
-                if '(' in type_part and ')' in type_part:
+            type_part, has_colon, _ = message.partition(':')
+            if has_colon:
+                head, has_scope, _ = type_part.partition('(')
+                if has_scope and ')' in type_part:
                     # Format: type(scope):
-                    commit_type = type_part.split('(')[0].strip().lower()
-                else:
-                    # Format: type:
-                    commit_type = type_part.strip().lower()
-
+                    type_part = head
                 # Strip breaking-change marker (e.g. feat! -> feat)
-                commit_type = commit_type.rstrip('!')
-                # Map to our standard types
-                commit_type = type_mapping.get(commit_type, 'misc')
+                # and map to our standard types
+                section = sections.get(type_part.strip().lower().rstrip('!'), misc)
             else:
                 # Handle "feat! message" format (breaking change, no colon)
-                first_token = message.split()[0] if message.split() else ''
+                tokens = message.split(None, 1)
+                first_token = tokens[0] if tokens else ''
                 if first_token.endswith('!'):
-                    commit_type = type_mapping.get(first_token[:-1].lower(), 'misc')
+                    section = sections.get(first_token[:-1].lower(), misc)
                 else:
-                    commit_type = 'misc'
+                    section = misc
 
-            groups[commit_type].append(commit)
+            section.append(commit)
 
         except Exception as e:
-            logging.debug(f"Could not parse commit message '{commit}': {e}")
-            groups['misc'].append(commit)
+            logging.debug("Could not parse commit message '%s': %s", commit, e)
+            misc.append(commit)
 
     return groups
 
@@ -502,29 +633,8 @@ def format_changelog_entry(version, date, groups, repo_url=None):
     Returns:
         str: Formatted changelog entry.
     """
-    section_order = [
-        'feature',
-        'fix',
-        'chore',
-        'docs',
-        'refactor',
-        'perf',
-        'test',
-        'misc',
-    ]
-    section_titles = {
-        'feature': 'Features',
-        'fix': 'Bug Fixes',
-        'chore': 'Chores',
-        'docs': 'Documentation',
-        'refactor': 'Refactors',
-        'perf': 'Performance Improvements',
-        'test': 'Tests',
-        'misc': 'Miscellaneous'
-    }
     entry_lines = [f"## {version} - {date}"]
-    for key in section_order:
-        title = section_titles[key]
+    for key, title in _CHANGELOG_SECTIONS:
         if groups[key]:
             entry_lines.append(f"### {title}")
             for msg in groups[key]:
@@ -534,64 +644,110 @@ def format_changelog_entry(version, date, groups, repo_url=None):
     return '\n'.join(entry_lines)
 
 
-def update_changelog(config, new_tag, repo, tag_last):
+_CHANGELOG_HEADER = "# Changelog\n\nAll notable changes to this project will be documented in this file.\n\n"
+_CHANGELOG_COPY_BUFSIZE = 1 << 20
+
+
+def render_changelog_entry(config, new_tag, repo, tag_last):
     """
-    Update the changelog file with a new version entry.
+    Render the changelog entry for the commits since tag_last, without touching any file.
 
     Args:
-        config (dict): Configuration dictionary containing changelog path.
-        new_tag (str): New version tag to add to changelog.
+        config (dict): Configuration dictionary; the GitHub settings are used for PR links.
+        new_tag (str): New version tag the entry is written for.
         repo: GitPython Repo object.
         tag_last (str): The previous tag to compare against.
-    """
-    changelog_file = Path(config["paths"]["changelog"])
 
+    Returns:
+        str: The formatted entry, or None when there are no commits to record.
+    """
     commits = get_commits_since_tag(repo, tag_last)
 
     if not commits:
-        logging.info("No commits to add to changelog")
-        return
+        return None
 
     # Group commits by type
     groups = group_commits_by_type(commits)
 
     # Generate changelog entry
     current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-    repo_url = None
-    gh = config.get("github", {})
-    if gh.get("repository") and gh.get("url"):
-        repo_url = f"{_web_url_from_api_url(gh['url'])}/{gh['repository']}"
-    changelog_entry = format_changelog_entry(new_tag, current_date, groups, repo_url)
+    return format_changelog_entry(new_tag, current_date, groups, _repo_web_url(config))
 
-    # Read existing changelog or create new one
-    if changelog_file.exists():
-        original = changelog_file.read_text()
-    else:
-        changelog_file.touch()
-        original = "# Changelog\n\nAll notable changes to this project will be documented in this file.\n\n"
-
-    # Add new entry at the top
-    changelog_file.write_text(f"{changelog_entry}\n{original}")
 
-    logging.info(f"Updated changelog with changes since {tag_last}")
+def update_changelog(config, new_tag, repo, tag_last):
+    """
+    Update the changelog file with a new version entry.
 
+    Args:
+        config (dict): Configuration dictionary containing changelog path.
+        new_tag (str): New version tag to add to changelog.
+        repo: GitPython Repo object.
+        tag_last (str): The previous tag to compare against.
 
-def _get_tag_effective_date(tag):
+    Returns:
+        str: The entry that was added, or None when there were no commits to record.
     """
-    Return the effective creation timestamp for a tag.
+    # Write through a symlinked CHANGELOG.md to its target instead of replacing the link
+    changelog_file = Path(os.path.realpath(config["paths"]["changelog"]))
+
+    changelog_entry = render_changelog_entry(config, new_tag, repo, tag_last)
+
+    if changelog_entry is None:
+        logging.info("No commits to add to changelog")
+        return None
+
+    # Add new entry at the top: write it to a sibling temp file, stream the
+    # existing changelog (or a fresh header) after it, then swap the files
+    tmp_file = changelog_file.with_name(f"{changelog_file.name}.tmp")
+    try:
+        with open(tmp_file, "wb") as out:
+            out.write(f"{changelog_entry}\n".encode("utf-8"))
+            if changelog_file.exists():
+                with open(changelog_file, "rb") as original:
+                    shutil.copyfileobj(original, out, _CHANGELOG_COPY_BUFSIZE)
+            else:
+                out.write(_CHANGELOG_HEADER.encode("utf-8"))
+        if changelog_file.exists():
+            # Keep the original permission bits on the swapped-in file
+            shutil.copymode(changelog_file, tmp_file)
+        os.replace(tmp_file, changelog_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    logging.info("Updated changelog with changes since %s", tag_last)
+    return changelog_entry
 
-    For annotated tags uses the tag object's own tagged_date.
-    For lightweight tags falls back to the underlying commit's committed_date.
+
+def commit_release(config, repo, new_tag):
+    """
+    Commit the release changelog and return the new commit SHA.
 
     Args:
-        tag (git.TagReference): A GitPython tag reference.
+        config (dict): Configuration dictionary containing changelog path and skip CI keyword.
+        repo: GitPython Repo object.
+        new_tag (str): Tag the release commit is created for.
 
     Returns:
-        int: Unix timestamp representing when the tag was effectively created.
+        str: SHA of the release commit.
+
+    Note:
+        Tracked changes are committed with a single `git commit -a`. The changelog
+        is staged explicitly only on the first release, while it is still untracked,
+        and never when it is gitignored.
     """
-    if tag.tag is not None:
-        return tag.tag.tagged_date
-    return tag.commit.committed_date
+    changelog = config["paths"]["changelog"]
+    changelog_rel = os.path.relpath(changelog, repo.working_tree_dir)
+    if (os.path.exists(changelog)
+            and (changelog_rel, 0) not in repo.index.entries
+            and not repo.ignored(changelog_rel)):
+        repo.git.add(changelog_rel)
+
+    repo.git.commit(
+        '-a', '--allow-empty', '-m',
+        f"chore(release): version {new_tag} {config['keywords']['skip_ci']}"
+    )
+    return repo.head.commit.hexsha
 
 
 def generate_changelog_between_tags(repo, repo_url=None) -> str:
@@ -614,73 +770,95 @@ def generate_changelog_between_tags(repo, repo_url=None) -> str:
         str: Formatted changelog entry suitable for display or writing to a
              file, or an explanatory string when no meaningful range exists.
     """
-    # Collect all tags reachable from HEAD.
+    # List tags reachable from HEAD, oldest first, in one call.
     # --merged filters to tags whose commits are ancestors of (or equal to) HEAD,
     # correctly excluding tags that exist only on unmerged branches.
+    # creatordate is the tagger date for annotated tags and the commit date
+    # for lightweight ones; ties fall back to refname order.
     try:
-        merged_output = repo.git.tag('--merged', 'HEAD')
+        merged_output = repo.git.for_each_ref(
+            '--merged', 'HEAD', '--sort=creatordate',
+            '--format=%(refname:short)', 'refs/tags/')
     except Exception as e:
-        logging.warning(f"Could not list merged tags: {e}")
+        logging.warning("Could not list merged tags: %s", e)
         return "No tags found in repository."
 
-    reachable_names = set(merged_output.split()) if merged_output else set()
+    sorted_tags = merged_output.split() if merged_output else []
 
-    if not reachable_names:
+    if not sorted_tags:
         logging.info("generate_changelog_between_tags: no tags reachable from HEAD")
         return "No tags found reachable from HEAD."
 
-    # Filter repo.tags to only reachable ones, then sort by effective date.
-    reachable_tags = [t for t in list(repo.tags) if t.name in reachable_names]
-
-    if not reachable_tags:
-        return "No tags found reachable from HEAD."
-
-    sorted_tags = sorted(reachable_tags, key=_get_tag_effective_date)
-
     latest_tag = sorted_tags[-1]
 
     if len(sorted_tags) == 1:
         # Only one tag: include every commit reachable from that tag.
         logging.info(
-            f"generate_changelog_between_tags: only one tag ({latest_tag.name}), "
-            "returning all commits up to it"
+            "generate_changelog_between_tags: only one tag (%s), "
+            "returning all commits up to it", latest_tag
         )
-        revision = latest_tag.name
+        revision = latest_tag
         from_tag_name = None
     else:
         second_latest_tag = sorted_tags[-2]
-        revision = f"{second_latest_tag.name}..{latest_tag.name}"
-        from_tag_name = second_latest_tag.name
-        logging.info(f"generate_changelog_between_tags: range {revision}")
+        revision = f"{second_latest_tag}..{latest_tag}"
+        from_tag_name = second_latest_tag
+        logging.info("generate_changelog_between_tags: range %s", revision)
 
     # Retrieve commits in the determined range.
     try:
-        raw_commits = list(repo.iter_commits(revision))
+        raw_commits = _log_commits(repo, revision)
     except Exception as e:
-        logging.warning(f"Could not retrieve commits for range '{revision}': {e}")
+        logging.warning("Could not retrieve commits for range '%s': %s", revision, e)
         return f"Could not retrieve commits between tags: {e}"
 
     # Handle the empty-range case (both tags on the same commit).
     if not raw_commits:
         if from_tag_name is not None:
             return (
-                f"No commits found between {from_tag_name} and {latest_tag.name} "
+                f"No commits found between {from_tag_name} and {latest_tag} "
                 "(both tags may point to the same commit)."
             )
-        return f"No commits found up to tag {latest_tag.name}."
+        return f"No commits found up to tag {latest_tag}."
 
     # Format commits in the "<sha7> <message>" form that group_commits_by_type expects.
     formatted_commits = [
-        f"{commit.hexsha[:7]} {_extract_subject(commit.message)}"
-        for commit in raw_commits
+        f"{hexsha[:7]} {_extract_subject(message)}"
+        for hexsha, message in raw_commits
     ]
 
     groups = group_commits_by_type(formatted_commits)
     current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-    return format_changelog_entry(latest_tag.name, current_date, groups, repo_url)
+    return format_changelog_entry(latest_tag, current_date, groups, repo_url)
+
+
+def get_latest_and_head_tags(repo):
+    """
+    Find the nearest tag reachable from HEAD and the tag on HEAD itself.
+
+    Runs one 'git describe --long', whose output has the form
+    '<tag>-<distance>-g<sha>'; a distance of 0 means HEAD itself is tagged.
+
+    Args:
+        repo (git.Repo): Git repository object.
+
+    Returns:
+        tuple: (tag_last, tag_head); either is None when there is no such tag.
+    """
+    try:
+        description = repo.git.describe(
+            '--tags', '--long', '--candidates=100', 'HEAD')
+    except GitCommandError as ex:
+        logging.debug(ex)
+        return None, None
 
+    # Tag names may contain '-', so split from the right
+    tag_last, distance, _ = description.rsplit('-', 2)
+    tag_head = tag_last if distance == '0' else None
+    return tag_last, tag_head
 
-def main():
+
+def main(repo_path=None, repo=None):
     """
     Main entry point for the Git Flow Action.
 
@@ -692,6 +870,10 @@ def main():
     5. Creates releases and updates changelog
     6. Outputs version information
 
+    Args:
+        repo_path (str, optional): Path to the repository. Defaults to the current working directory.
+        repo (optional): An already open GitPython Repo object to use instead of opening repo_path.
+
     Returns:
         int: Exit code (0 for success, non-zero for failure)
     """
@@ -704,12 +886,16 @@ def main():
     try:
         validate_config(config)
     except ValueError as ex:
-        logging.error(f"Configuration validation failed: {ex}")
+        logging.error("Configuration validation failed: %s", ex)
 
     logging.getLogger().setLevel(config["log_level"])
 
-    repo_path = os.getcwd()
-    repo = real_git.Repo(repo_path)
+    if repo is None:
+        repo = real_git.Repo(repo_path or os.getcwd())
+    repo.git.update_environment(**_GIT_NON_INTERACTIVE_ENV)
+
+    # The changelog path is relative to the repository root, not to the process cwd
+    config["paths"]["changelog"] = os.path.join(repo.working_tree_dir, config["paths"]["changelog"])
 
     #
     # Configure Git
@@ -722,51 +908,46 @@ def main():
     #  https://github.com/actions/checkout/issues/766
     #  https://github.com/actions/checkout/issues/760
     gh_workspace = os.getenv("GITHUB_WORKSPACE")
-    os.system(f"git config --global --add safe.directory {gh_workspace}")
+    if gh_workspace:
+        repo.git.config('--global', '--add', 'safe.directory', gh_workspace)
 
     #
-    # Get Git tag (for latest available)
+    # Get Git tags (latest available and HEAD) with a single describe
     #
-    try:
-        tag_last = repo.git.describe(
-            '--tags', '--abbrev=0', '--candidates=100')
-    except GitCommandError as ex:
+    tag_last, tag_head = get_latest_and_head_tags(repo)
+    if tag_last is None:
         logging.warning("Not found any latest available Git tag")
-        logging.debug(ex)
-        tag_last = None
-
-    #
-    # Get Git tag (for HEAD)
-    #
-    try:
-        tag_head = repo.git.describe("--exact-match", "--tags", "HEAD")
-    except GitCommandError as ex:
+    if tag_head is None:
         logging.warning("Not found Git tag for HEAD")
-        logging.debug(ex)
-        tag_head = None
 
     active_branch = str(repo.active_branch)
-    commit_message = str(repo.head.reference.commit.message).rstrip('\n')
+    # One 'git log -1' yields the HEAD SHA, parents and raw message without
+    # loading the commit object through GitPython
+    head_sha, _, head_log = repo.git.log('-1', '--format=%H%n%P%n%B', 'HEAD', '--').partition('\n')
+    head_parents, _, head_message = head_log.partition('\n')
+    commit_message = _keyword_message(head_message, is_merge=' ' in head_parents)
 
     logging.info("Gathering information ...")
-    logging.info(f"Git branch: '{active_branch}'")
-    logging.info(f"Git commit message: '{commit_message}'")
-    logging.info(f"Git tag (HEAD): '{tag_head}'")
-    logging.info(f"Git tag (latest available): '{tag_last}'")
+    logging.info("Git branch: '%s'", active_branch)
+    logging.info("Git commit message: '%s'", commit_message)
+    logging.info("Git tag (HEAD): '%s'", tag_head)
+    logging.info("Git tag (latest available): '%s'", tag_last)
 
     #
     # Check if new tag is not needed
     #
     if tag_head is not None:
-        logging.warning(f"Git tag for HEAD has already exist: {tag_head}")
+        logging.warning("Git tag for HEAD has already exist: %s", tag_head)
         actions_output(tag_head)
         return
 
-    if active_branch == config["primary_branch"]:
+    is_primary = active_branch == config["primary_branch"]
+    is_release = active_branch.startswith("release/")
+
+    if is_primary:
         bump_type = get_bump_type(config, commit_message)
 
-        if (active_branch in config["auto_release_branches"]) or (
-                '[RELEASE]' in commit_message and active_branch == config["primary_branch"]):
+        if active_branch in config["auto_release_branches"] or '[RELEASE]' in commit_message:
 
             if bump_type == "patch":
                 logging.warning(
@@ -783,22 +964,16 @@ def main():
             #
             # Calculate new tag
             #
-            new_tag = f"{config['tag_prefix']['release']}{str(new_semver_version)}"
-            logging.info(f"New tag for primary branch: {new_tag}")
+            new_tag = f"{config['tag_prefix']['release']}{new_semver_version}"
+            logging.info("New tag for primary branch: %s", new_tag)
 
             #
             # Generate changelog
             #
-            update_changelog(config, new_tag, repo, tag_last)
-            repo.git.add(A=True)
-            repo.git.commit(
-                '--allow-empty', '-m',
-                f"chore(release): version {new_tag} {config['keywords']['skip_ci']}"
-            )
-
-            commit_sha = repo.head.commit.hexsha
+            changelog_entry = update_changelog(config, new_tag, repo, tag_last)
+            commit_sha = commit_release(config, repo, new_tag)
             origin = repo.remote(name='origin')
-            if config["features"]["enable_git_push"] == "true":
+            if config["features"]["enable_git_push"]:
                 origin.push()
                 logging.info("Git branch has been pushed")
             else:
@@ -813,9 +988,9 @@ def main():
             #
             # Create GitHub release
             #
-            if config["features"]["enable_github_release"] == "true":
-                if config["features"]["enable_git_push"] == "true":
-                    create_github_release(config, new_tag, repo, tag_last)
+            if config["features"]["enable_github_release"]:
+                if config["features"]["enable_git_push"]:
+                    create_github_release(config, new_tag, repo, tag_last, changelog_entry)
                 else:
                     logging.warning(
                         "GitHub release can't be created, because tags hasn't been pushed")
@@ -843,20 +1018,14 @@ def main():
                 config, tag_last, bump_type
             )
 
-            new_tag = f"{config['tag_prefix']['candidate']}{str(new_semver_version)}"
-            logging.info(f"New tag: {new_tag}")
+            new_tag = f"{config['tag_prefix']['candidate']}{new_semver_version}"
+            logging.info("New tag: %s", new_tag)
 
             #
             # Generate changelog
             #
             update_changelog(config, new_tag, repo, tag_last)
-            repo.git.add(A=True)
-            repo.git.commit(
-                '--allow-empty', '-m',
-                f"chore(release): version {new_tag} {config['keywords']['skip_ci']}"
-            )
-
-            commit_sha = repo.head.commit.hexsha
+            commit_sha = commit_release(config, repo, new_tag)
             git_create_and_push_tag(config, repo, new_tag, commit_sha)
 
             #
@@ -864,7 +1033,7 @@ def main():
             #
             actions_output(new_tag)
 
-    if active_branch.startswith("release/"):
+    elif is_release:
         logging.warning(
             "It's release branch, only 'patch' version bump is available. All keywords in messages are ignored")
         bump_type = "patch"
@@ -873,29 +1042,23 @@ def main():
         # Calculate new version
         new_semver_version = get_new_semver_version(
             config, tag_last, bump_type)
-        new_tag = f"{config['tag_prefix']['release']}{str(new_semver_version)}"
-        logging.info(f"New tag: {new_tag}")
+        new_tag = f"{config['tag_prefix']['release']}{new_semver_version}"
+        logging.info("New tag: %s", new_tag)
 
         #
         # Check release version and tag version
-        tag_version_family = f"{new_semver_version[0]}.{new_semver_version[1]}"
+        tag_version_family = f"{new_semver_version.major}.{new_semver_version.minor}"
         branch_version_family = active_branch.replace("release/", "")
         if tag_version_family != branch_version_family:
             logging.warning(
-                f"Branch version family {branch_version_family} is not the same as Tag version family {tag_version_family}")
+                "Branch version family %s is not the same as Tag version family %s", branch_version_family, tag_version_family)
 
         #
         # Generate changelog
         #
-        update_changelog(config, new_tag, repo, tag_last)
-        repo.git.add(A=True)
-        repo.git.commit(
-            '--allow-empty', '-m',
-            f"chore(release): version {new_tag} {config['keywords']['skip_ci']}"
-        )
-
-        commit_sha = repo.head.commit.hexsha
-        if config["features"]["enable_git_push"] == "true":
+        changelog_entry = update_changelog(config, new_tag, repo, tag_last)
+        commit_sha = commit_release(config, repo, new_tag)
+        if config["features"]["enable_git_push"]:
             repo.remote(name='origin').push()
 
         #
@@ -904,9 +1067,9 @@ def main():
 
         #
         # Create GitHub release
-        if config["features"]["enable_github_release"] == "true":
-            if config["features"]["enable_git_push"] == "true":
-                create_github_release(config, new_tag)
+        if config["features"]["enable_github_release"]:
+            if config["features"]["enable_git_push"]:
+                create_github_release(config, new_tag, repo, tag_last, changelog_entry)
             else:
                 logging.warning(
                     "GitHub release can't be created, because tags hasn't been pushed")
@@ -915,8 +1078,8 @@ def main():
         # Output
         actions_output(new_tag)
 
-    if active_branch != config["primary_branch"] and not active_branch.startswith("release/"):
-        version = "sha/" + str(repo.head.object.hexsha[0:7])
+    else:
+        version = "sha/" + head_sha[0:7]
         logging.info("Custom build version is: %s", version)
         logging.info(
             "It is a build for custom branch (non %s or release). Tag won't be created", config["primary_branch"])
@@ -0,0 +1,10 @@
+import os
+
+
+def pytest_configure(config):
+    """Keep tmp_path repositories on a RAM-backed filesystem when one is available"""
+    # Every scenario runs dozens of git init/commit/tag calls; on Linux
+    # /dev/shm is tmpfs, so object writes never touch the disk. An explicit
+    # --basetemp or PYTEST_DEBUG_TEMPROOT still wins.
+    if config.option.basetemp is None and os.access("/dev/shm", os.W_OK | os.X_OK):
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
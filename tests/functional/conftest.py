@@ -1,8 +1,8 @@
 import os
 import sys
 import pytest
-import logging
 from pathlib import Path
+from unittest.mock import patch
 
 # Add project root to Python path
 project_root = str(Path(__file__).parent.parent)
@@ -10,38 +10,28 @@ sys.path.insert(0, project_root)
 
 
 @pytest.fixture(autouse=True)
-def setup_test_env():
+def setup_test_env(tmp_path):
     """Setup test environment variables"""
-    # Set test environment variables
-    os.environ["INPUT_INIT_VERSION"] = "0.0.0"
-    os.environ["INPUT_PRIMARY_BRANCH"] = "main"
-    os.environ["INPUT_TAG_PREFIX_CANDIDATE"] = "rc/"
-    os.environ["INPUT_TAG_PREFIX_RELEASE"] = ""
-    os.environ["INPUT_ENABLE_GIT_PUSH"] = "true"
-    os.environ["INPUT_ENABLE_GITHUB_RELEASE"] = "true"
-    os.environ["INPUT_ENABLE_CUSTOM_BRANCH"] = "true"
-    os.environ["INPUT_AUTO_RELEASE_BRANCHES"] = "main"
-    os.environ["INPUT_LOG_LEVEL"] = "DEBUG"
+    # Set test environment variables; patch.dict restores the previous
+    # environment (including any pre-existing values) on exit
+    test_env = {
+        "INPUT_INIT_VERSION": "0.0.0",
+        "INPUT_PRIMARY_BRANCH": "main",
+        "INPUT_TAG_PREFIX_CANDIDATE": "rc/",
+        "INPUT_TAG_PREFIX_RELEASE": "",
+        "INPUT_ENABLE_GIT_PUSH": "true",
+        "INPUT_ENABLE_GITHUB_RELEASE": "true",
+        "INPUT_ENABLE_CUSTOM_BRANCH": "true",
+        "INPUT_AUTO_RELEASE_BRANCHES": "main",
+        # The action's default log level
+        "INPUT_LOG_LEVEL": "INFO",
+        # main() writes git config with --global; give every test its own file so
+        # parallel (xdist) workers don't race on ~/.gitconfig.lock or touch the user's config
+        "GIT_CONFIG_GLOBAL": str(tmp_path / "gitconfig"),
+        # Skip optional index refreshes/locks that status and friends take
+        "GIT_OPTIONAL_LOCKS": "0",
+    }
 
-    # Setup logging for tests
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    with patch.dict(os.environ, test_env):
+        yield
 
-    yield
-
-    # Cleanup
-    for key in [
-        "INPUT_INIT_VERSION",
-        "INPUT_PRIMARY_BRANCH",
-        "INPUT_TAG_PREFIX_CANDIDATE",
-        "INPUT_TAG_PREFIX_RELEASE",
-        "INPUT_ENABLE_GIT_PUSH",
-        "INPUT_ENABLE_GITHUB_RELEASE",
-        "INPUT_ENABLE_CUSTOM_BRANCH",
-        "INPUT_AUTO_RELEASE_BRANCHES",
-        "INPUT_LOG_LEVEL"
-    ]:
-        if key in os.environ:
-            del os.environ[key]
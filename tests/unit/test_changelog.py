@@ -1,90 +1,135 @@
 """Unit tests for changelog operations."""
 
+import collections
+import re
 import pytest
 from pathlib import Path
-from src.main import update_changelog, group_commits_by_type, generate_changelog_between_tags
+from git import Repo
+from src.main import (
+    update_changelog,
+    render_changelog_entry,
+    group_commits_by_type,
+    generate_changelog_between_tags,
+    _extract_subject,
+)
 
 
-@pytest.fixture
-def temp_changelog(tmp_path):
-    """Create a temporary changelog file for testing."""
-    changelog_file = tmp_path / "CHANGELOG.md"
-    changelog_file.write_text("""# Changelog
+# Baseline changelog shared by the temp_changelog tests; encoded once at import
+_BASELINE_CHANGELOG = """# Changelog
 
 ## v1.0.0
 - Initial release
 
 ## v0.9.0
 - Beta release
-""")
+""".encode("utf-8")
+
+
+@pytest.fixture
+def temp_changelog(tmp_path):
+    """Create a temporary changelog file for testing."""
+    changelog_file = tmp_path / "CHANGELOG.md"
+    changelog_file.write_bytes(_BASELINE_CHANGELOG)
     return changelog_file
 
 
-def _dummy_repo_with_commit():
-    class DummyCommit:
-        def __init__(self, hexsha, message):
-            self.hexsha = hexsha
-            self.message = message
-    class DummyRepo:
-        def iter_commits(self, rev):
-            return [DummyCommit('abc1234', 'feat: dummy commit for changelog')]
-    return DummyRepo()
+def _render_git_log(commits):
+    """Render commits the way `git log -z --format=%H%n%B` prints them."""
+    return "\0".join(f"{commit.hexsha}\n{commit.message}" for commit in commits)
 
-def test_update_changelog_new_version(temp_changelog):
-    """Test adding a new version to changelog."""
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.1.0"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
 
-    update_changelog(config, new_tag, repo, tag_last)
+class _LogRepo:
+    """Fake repo whose `git log` output is built from self.commits(revision)."""
 
-    content = temp_changelog.read_text()
-    assert content.startswith(f"## {new_tag} - ")
-    assert "## v1.0.0" in content
-    assert "## v0.9.0" in content
+    @property
+    def git(self):
+        repo = self
 
+        class _Git:
+            def log(self, revision, *args):
+                return _render_git_log(repo.commits(revision))
 
-def test_update_changelog_existing_version(temp_changelog):
-    """Test updating an existing version in changelog."""
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.0.0"  # Already exists
-    repo = _dummy_repo_with_commit()
-    tag_last = "v0.9.0"
+        return _Git()
 
-    # This should not raise an error, but should add a duplicate entry
-    update_changelog(config, new_tag, repo, tag_last)
 
-    content = temp_changelog.read_text()
-    assert content.count(f"## {new_tag} - ") == 1
+class _StaticLogRepo(_LogRepo):
+    """Fake repo that returns the same commits for every revision."""
+
+    def __init__(self, commits):
+        self._commits = commits
+
+    def commits(self, rev):
+        return self._commits
+
+
+# Commit data never changes between tests, so the fake repos are built once
+_Commit = collections.namedtuple("_Commit", "hexsha message")
 
+_DUMMY_REPO = _StaticLogRepo((_Commit("abc1234", "feat: dummy commit for changelog"),))
 
-def test_update_changelog_invalid_version(temp_changelog):
-    """Test updating changelog with invalid version format."""
+_COMPLEX_REPO = _StaticLogRepo((
+    _Commit("a1b2c3d", "feat(auth): add login"),
+    _Commit("b2c3d4e", "fix(auth): handle token expiry"),
+    _Commit("c3d4e5f", "chore: update deps"),
+    _Commit("d4e5f6g", "docs: update API docs"),
+    _Commit("e5f6g7h", "refactor(core): cleanup"),
+    _Commit("f6g7h8i", "perf: optimize queries"),
+    _Commit("g7h8i9j", "test: add integration tests"),
+    _Commit("h8i9j0k", "style: fix lint issues"),
+    _Commit("i9j0k1l", "feat(ui): add dark mode"),
+    _Commit("j0k1l2m", "misc: update copyright"),
+    _Commit("k1l2m3n", "fix: general bugfix"),
+))
+
+
+@pytest.mark.parametrize("new_tag,tag_last", [
+    ("v1.1.0", "v1.0.0"),
+    ("v1.0.0", "v0.9.0"),  # Already exists; gets a new entry, not an error
+    ("v1.0.0+meta", "v1.0.0"),
+], ids=["new_version", "existing_version", "special_characters"])
+def test_update_changelog_variants(temp_changelog, new_tag, tag_last):
+    """Test that the new entry is prepended once and the existing changelog is kept as is."""
     config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "invalid-version"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
 
-    # This should not raise an error, but should add the tag as is
-    update_changelog(config, new_tag, repo, tag_last)
+    update_changelog(config, new_tag, _DUMMY_REPO, tag_last)
 
     content = temp_changelog.read_text()
     assert content.startswith(f"## {new_tag} - ")
+    assert content.count(f"## {new_tag} - ") == 1
+    # The original formatting is preserved byte for byte after the new entry
+    assert content.endswith(_BASELINE_CHANGELOG.decode("utf-8"))
+
+
+@pytest.mark.parametrize("new_tag", [
+    "invalid-version",
+    "v1.1.0 (2024-01-01)",
+    "v1.1.0 (invalid-date)",
+], ids=["invalid_version", "with_date", "with_invalid_date"])
+def test_render_changelog_entry_variants(new_tag):
+    """Test that unusual tags are rendered as is, without raising."""
+    entry = render_changelog_entry({}, new_tag, _DUMMY_REPO, "v1.0.0")
+
+    assert entry.startswith(f"## {new_tag} - ")
+
 
+class _EmptyRepo(_LogRepo):
+    def commits(self, rev):
+        return []
 
-def test_update_changelog_empty_changes(temp_changelog):
-    """Test updating changelog with empty changes."""
+
+def test_render_changelog_entry_without_commits():
+    """Test that there is no entry to render when no commits were made since tag_last."""
+    assert render_changelog_entry({}, "v1.1.0", _EmptyRepo(), "v1.0.0") is None
+
+
+def test_update_changelog_without_commits_leaves_file_untouched(temp_changelog):
+    """Test that a run with no new commits keeps CHANGELOG.md byte for byte and leaves no temp file."""
     config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.1.0"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
 
-    update_changelog(config, new_tag, repo, tag_last)
+    assert update_changelog(config, "v1.1.0", _EmptyRepo(), "v1.0.0") is None
 
-    content = temp_changelog.read_text()
-    assert content.startswith(f"## {new_tag} - ")
-    # Should not add any empty lines after the new version
+    assert temp_changelog.read_bytes() == _BASELINE_CHANGELOG
+    assert [p.name for p in temp_changelog.parent.iterdir()] == ["CHANGELOG.md"]
 
 
 def test_update_changelog_nonexistent_file(tmp_path):
@@ -92,7 +137,7 @@ def test_update_changelog_nonexistent_file(tmp_path):
     changelog_file = tmp_path / "nonexistent.md"
     config = {"paths": {"changelog": str(changelog_file)}}
     new_tag = "v1.0.0"
-    repo = _dummy_repo_with_commit()  # Always returns a commit
+    repo = _DUMMY_REPO  # Always returns a commit
     tag_last = "v0.9.0"
 
     update_changelog(config, new_tag, repo, tag_last)
@@ -102,304 +147,236 @@ def test_update_changelog_nonexistent_file(tmp_path):
     assert content.startswith(f"## {new_tag} - ")
 
 
-def test_update_changelog_empty_file(tmp_path):
-    """Test updating empty changelog file."""
-    changelog_file = tmp_path / "empty.md"
-    changelog_file.touch()
+def test_update_changelog_nonexistent_file_gets_header(tmp_path):
+    """A newly created changelog ends with the default header and leaves no temp file behind."""
+    changelog_file = tmp_path / "CHANGELOG.md"
     config = {"paths": {"changelog": str(changelog_file)}}
-    new_tag = "v1.0.0"
-    repo = _dummy_repo_with_commit()  # Always returns a commit
-    tag_last = "v0.9.0"
 
-    update_changelog(config, new_tag, repo, tag_last)
+    update_changelog(config, "v1.0.0", _DUMMY_REPO, "v0.9.0")
 
     content = changelog_file.read_text()
-    assert content.startswith(f"## {new_tag} - ")
+    assert content.startswith("## v1.0.0 - ")
+    assert content.endswith("# Changelog\n\nAll notable changes to this project will be documented in this file.\n\n")
+    assert [p.name for p in tmp_path.iterdir()] == ["CHANGELOG.md"]
 
 
-def test_update_changelog_complex_scenario(tmp_path, mocker):
-    """Test update_changelog with a complex set of commits and tags."""
-    from datetime import datetime
-    import re
-    # Prepare a fake repo object
-    class FakeCommit:
-        def __init__(self, hexsha, message):
-            self.hexsha = hexsha
-            self.message = message
-    class FakeRepo:
-        def iter_commits(self, rev):
-            # Simulate commits between tags
-            return [
-                FakeCommit('a1b2c3d', 'feat(auth): add login'),
-                FakeCommit('b2c3d4e', 'fix(auth): handle token expiry'),
-                FakeCommit('c3d4e5f', 'chore: update deps'),
-                FakeCommit('d4e5f6g', 'docs: update API docs'),
-                FakeCommit('e5f6g7h', 'refactor(core): cleanup'),
-                FakeCommit('f6g7h8i', 'perf: optimize queries'),
-                FakeCommit('g7h8i9j', 'test: add integration tests'),
-                FakeCommit('h8i9j0k', 'style: fix lint issues'),
-                FakeCommit('i9j0k1l', 'feat(ui): add dark mode'),
-                FakeCommit('j0k1l2m', 'misc: update copyright'),
-                FakeCommit('k1l2m3n', 'fix: general bugfix'),
-            ]
-    repo = FakeRepo()
-    changelog_file = tmp_path / "COMPLEX_CHANGELOG.md"
+def test_update_changelog_preserves_existing_bytes(tmp_path):
+    """The old changelog, including non-ASCII text, is appended byte for byte."""
+    changelog_file = tmp_path / "CHANGELOG.md"
+    old_body = "## v0.9.0 - 2024-01-01\n- entry \u2713\n\n".encode("utf-8")
+    changelog_file.write_bytes(old_body)
     config = {"paths": {"changelog": str(changelog_file)}}
-    new_tag = "v2.0.0"
-    tag_last = "v1.0.0"
 
-    # Patch datetime to return a fixed date
-    mocker.patch("src.main.datetime.datetime", autospec=True)
-    from src import main as main_mod
-    main_mod.datetime.datetime.now.return_value.strftime.return_value = "2025-07-30"
+    update_changelog(config, "v1.0.0", _DUMMY_REPO, "v0.9.0")
 
-    # Run changelog update
-    main_mod.update_changelog(config, new_tag, repo, tag_last)
+    content = changelog_file.read_bytes()
+    assert content.startswith(b"## v1.0.0 - ")
+    assert content.endswith(old_body)
 
-    content = changelog_file.read_text()
-    # Check version/date header
-    assert f"## {new_tag} - 2025-07-30" in content
-    # Check all sections present
-    assert "### Features" in content
-    assert "### Bug Fixes" in content
-    assert "### Chores" in content
-    assert "### Documentation" in content
-    assert "### Refactors" in content
-    assert "### Performance Improvements" in content
-    assert "### Tests" in content
-    assert "### Miscellaneous" in content
-    # Check commit messages in correct sections
-    assert "add login" in content
-    assert "add dark mode" in content
-    assert "handle token expiry" in content
-    assert "general bugfix" in content
-    assert "update deps" in content
-    assert "update API docs" in content
-    assert "cleanup" in content
-    assert "optimize queries" in content
-    assert "add integration tests" in content
-    assert "fix lint issues" in content  # Should be in Miscellaneous
-    assert "update copyright" in content
-    # Check order: Features first, then Bug Fixes, etc.
-    section_indices = [
-        content.index("### Features"),
-        content.index("### Bug Fixes"),
-        content.index("### Chores"),
-        content.index("### Documentation"),
-        content.index("### Refactors"),
-        content.index("### Performance Improvements"),
-        content.index("### Tests"),
-        content.index("### Miscellaneous")
-    ]
-    assert section_indices == sorted(section_indices)
 
+def test_update_changelog_keeps_file_mode(temp_changelog):
+    """The rewritten changelog keeps the original permission bits."""
+    temp_changelog.chmod(0o640)
 
-def test_update_changelog_preserves_formatting(temp_changelog):
-    """Test that existing formatting is preserved."""
-    original_content = temp_changelog.read_text()
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.1.0"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
+    update_changelog({"paths": {"changelog": str(temp_changelog)}}, "v1.1.0", _DUMMY_REPO, "v1.0.0")
 
-    update_changelog(config, new_tag, repo, tag_last)
+    assert temp_changelog.stat().st_mode & 0o777 == 0o640
 
-    content = temp_changelog.read_text()
-    assert content.startswith(f"## {new_tag} - ")
-    # Should preserve the original formatting
-    assert "# Changelog" in content
-    assert original_content in content
 
+def test_update_changelog_writes_through_symlink(tmp_path, temp_changelog):
+    """A symlinked CHANGELOG.md stays a symlink; the entry lands in its target."""
+    link = tmp_path / "docs-CHANGELOG.md"
+    link.symlink_to(temp_changelog)
 
-def test_update_changelog_with_date(temp_changelog):
-    """Test updating changelog with version and date."""
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.1.0 (2024-01-01)"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
+    update_changelog({"paths": {"changelog": str(link)}}, "v1.1.0", _DUMMY_REPO, "v1.0.0")
 
-    update_changelog(config, new_tag, repo, tag_last)
+    assert link.is_symlink()
+    assert temp_changelog.read_text().startswith("## v1.1.0 - ")
 
-    content = temp_changelog.read_text()
-    assert content.startswith(f"## {new_tag} - ")
 
+def test_update_changelog_failure_leaves_no_temp_file(temp_changelog, monkeypatch):
+    """A failed rewrite keeps the original changelog and removes the temp file."""
+    def failing_copy(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr("src.main.shutil.copyfileobj", failing_copy)
 
-def test_update_changelog_with_invalid_date(temp_changelog):
-    """Test updating changelog with invalid date format."""
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.1.0 (invalid-date)"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
+    with pytest.raises(OSError, match="disk full"):
+        update_changelog({"paths": {"changelog": str(temp_changelog)}}, "v1.1.0", _DUMMY_REPO, "v1.0.0")
+
+    assert temp_changelog.read_bytes() == _BASELINE_CHANGELOG
+    assert [p.name for p in temp_changelog.parent.iterdir()] == ["CHANGELOG.md"]
+
+
+def test_update_changelog_empty_file(tmp_path):
+    """Test updating empty changelog file."""
+    changelog_file = tmp_path / "empty.md"
+    changelog_file.touch()
+    config = {"paths": {"changelog": str(changelog_file)}}
+    new_tag = "v1.0.0"
+    repo = _DUMMY_REPO  # Always returns a commit
+    tag_last = "v0.9.0"
 
-    # This should not raise an error
     update_changelog(config, new_tag, repo, tag_last)
 
-    content = temp_changelog.read_text()
+    content = changelog_file.read_text()
     assert content.startswith(f"## {new_tag} - ")
 
 
-def test_update_changelog_with_special_characters(temp_changelog):
-    """Test updating changelog with special characters in version."""
-    config = {"paths": {"changelog": str(temp_changelog)}}
-    new_tag = "v1.0.0+meta"
-    repo = _dummy_repo_with_commit()
-    tag_last = "v1.0.0"
+class _FrozenNow:
+    def strftime(self, fmt):
+        return "2025-07-30"
 
-    update_changelog(config, new_tag, repo, tag_last)
 
-    content = temp_changelog.read_text()
-    assert f"## {new_tag} - " in content
-    assert "## v1.0.0" in content  # Original entry should still be there
+class _FrozenDateTime:
+    """Stands in for datetime.datetime; update_changelog only calls now().strftime()."""
 
+    @classmethod
+    def now(cls):
+        return _FrozenNow()
 
-def test_group_commits_by_type_feature():
-    """Test grouping feature commits, including special characters."""
-    commits = [
-        "abc123 feat(auth): add login functionality",
-        "def456 feature(ui): enhance button styles",
-        "789012 feat: add dark mode toggle",
-        "xyz987 feat(api+meta): support v1.0.0+meta",
-        "uvw654 feat: handle special chars in version v1.2.3-beta"
-    ]
-    
-    result = group_commits_by_type(commits)
-    
-    assert len(result['feature']) == 5
-    assert "feat(auth): add login functionality" in result['feature'][0]
-    assert "feature(ui): enhance button styles" in result['feature'][1]
-    assert "feat: add dark mode toggle" in result['feature'][2]
-    assert "feat(api+meta): support v1.0.0+meta" in result['feature'][3]
-    assert "feat: handle special chars in version v1.2.3-beta" in result['feature'][4]
 
+def test_update_changelog_complex_scenario(tmp_path, monkeypatch):
+    """Test update_changelog with a complex set of commits and tags."""
+    repo = _COMPLEX_REPO
+    changelog_file = tmp_path / "COMPLEX_CHANGELOG.md"
+    config = {"paths": {"changelog": str(changelog_file)}}
+    new_tag = "v2.0.0"
+    tag_last = "v1.0.0"
 
-def test_group_commits_by_type_fix():
-    """Test grouping fix commits."""
-    commits = [
-        "abc123 fix(auth): handle expired tokens",
-        "def456 bugfix(api): fix 500 error on null input"
-    ]
-    
-    result = group_commits_by_type(commits)
-    
-    assert len(result['fix']) == 2
-    assert "fix(auth): handle expired tokens" in result['fix'][0]
-    assert "bugfix(api): fix 500 error on null input" in result['fix'][1]
+    # Pin the date
+    monkeypatch.setattr("src.main.datetime.datetime", _FrozenDateTime)
 
+    # Run changelog update
+    update_changelog(config, new_tag, repo, tag_last)
 
-def test_group_commits_by_type_other_types():
-    """Test grouping other commit types."""
-    commits = [
-        "abc123 chore: update dependencies",
-        "def456 docs: update README",
-        "789012 refactor: clean up code",
-        "345678 perf: optimize database queries",
-        "901234 test: add unit tests",
-        "567890 style: fix linting issues"
+    content = changelog_file.read_text()
+    # Check version/date header
+    assert f"## {new_tag} - 2025-07-30" in content
+    # Check every commit subject made it in, collecting them in one scan
+    expected_subjects = {
+        "add login", "add dark mode", "handle token expiry", "general bugfix",
+        "update deps", "update API docs", "cleanup", "optimize queries",
+        "add integration tests", "fix lint issues", "update copyright",
+    }
+    found = set(re.findall("|".join(map(re.escape, expected_subjects)), content))
+    assert found == expected_subjects
+    # Check all sections are present in order: Features first, then Bug Fixes,
+    # etc. One scan records the headings in the order they first appear
+    section_order = {}
+    for heading in re.finditer(r"### (?:Features|Bug Fixes|Chores|Documentation|Refactors"
+                               r"|Performance Improvements|Tests|Miscellaneous)\n", content):
+        section_order.setdefault(heading.group().rstrip("\n"), heading.start())
+    assert list(section_order) == [
+        "### Features", "### Bug Fixes", "### Chores", "### Documentation",
+        "### Refactors", "### Performance Improvements", "### Tests", "### Miscellaneous",
     ]
-    
-    result = group_commits_by_type(commits)
-    
-    assert len(result['chore']) == 1
-    assert len(result['docs']) == 1
-    assert len(result['refactor']) == 1
-    assert len(result['perf']) == 1
-    assert len(result['test']) == 1
-    assert "style: fix linting issues" in result['misc'][0]  # style not in our mapping
 
 
-def test_group_commits_by_type_malformed():
-    """Test handling of malformed commit messages."""
-    commits = [
-        "abc123",  # No message
-        "def456 : no type",  # Empty type
-        "789012 (scope): missing type",  # Missing type
-        "345678 invalid-type: unknown type"  # Unknown type
-    ]
-    
+_FEATURE_COMMITS = (
+    "abc123 feat(auth): add login functionality",
+    "def456 feature(ui): enhance button styles",
+    "789012 feat: add dark mode toggle",
+    "xyz987 feat(api+meta): support v1.0.0+meta",
+    "uvw654 feat: handle special chars in version v1.2.3-beta",
+)
+
+_FIX_COMMITS = (
+    "abc123 fix(auth): handle expired tokens",
+    "def456 bugfix(api): fix 500 error on null input",
+)
+
+_OTHER_COMMITS = (
+    "abc123 chore: update dependencies",
+    "def456 docs: update README",
+    "789012 refactor: clean up code",
+    "345678 perf: optimize database queries",
+    "901234 test: add unit tests",
+    "567890 style: fix linting issues",
+)
+
+_MALFORMED_COMMITS = (
+    "abc123",  # No message
+    "def456 : no type",  # Empty type
+    "789012 (scope): missing type",  # Missing type
+    "345678 invalid-type: unknown type",  # Unknown type
+)
+
+_MIXED_COMMITS = (
+    "abc123 feat(auth): add login",
+    "def456 fix(auth): handle token expiry",
+    "789012 chore: update deps",
+    "345678 docs: update API docs",
+    "901234 feat(ui): add dark mode",
+)
+
+
+@pytest.mark.parametrize("commits,counts,spot_checks", [
+    # Including special characters
+    (_FEATURE_COMMITS, {"feature": 5}, [
+        ("feat(auth): add login functionality", "feature", 0),
+        ("feature(ui): enhance button styles", "feature", 1),
+        ("feat: add dark mode toggle", "feature", 2),
+        ("feat(api+meta): support v1.0.0+meta", "feature", 3),
+        ("feat: handle special chars in version v1.2.3-beta", "feature", 4),
+    ]),
+    (_FIX_COMMITS, {"fix": 2}, [
+        ("fix(auth): handle expired tokens", "fix", 0),
+        ("bugfix(api): fix 500 error on null input", "fix", 1),
+    ]),
+    (_OTHER_COMMITS, {"chore": 1, "docs": 1, "refactor": 1, "perf": 1, "test": 1}, [
+        ("style: fix linting issues", "misc", 0),  # style not in our mapping
+    ]),
+    # All should go to misc
+    (_MALFORMED_COMMITS, {"misc": 4}, []),
+    (_MIXED_COMMITS, {"feature": 2, "fix": 1, "chore": 1, "docs": 1, "misc": 0}, [
+        ("feat(auth): add login", "feature", 0),
+        ("fix(auth): handle token expiry", "fix", 0),
+        ("chore: update deps", "chore", 0),
+        ("docs: update API docs", "docs", 0),
+        ("feat(ui): add dark mode", "feature", 1),
+    ]),
+], ids=["feature", "fix", "other_types", "malformed", "mixed"])
+def test_group_commits_by_type(commits, counts, spot_checks):
+    """Test that commits land in the expected groups, in order and with their content preserved."""
     result = group_commits_by_type(commits)
-    
-    assert len(result['misc']) == 4  # All should go to misc
-
 
-def test_group_commits_by_type_mixed():
-    """Test grouping with mixed commit types."""
-    commits = [
-        "abc123 feat(auth): add login",
-        "def456 fix(auth): handle token expiry",
-        "789012 chore: update deps",
-        "345678 docs: update API docs",
-        "901234 feat(ui): add dark mode"
-    ]
-    
-    result = group_commits_by_type(commits)
-    
-    assert len(result['feature']) == 2
-    assert len(result['fix']) == 1
-    assert len(result['chore']) == 1
-    assert len(result['docs']) == 1
-    assert len(result['misc']) == 0  # No unexpected types
-    
-    # Verify the content is preserved
-    assert "feat(auth): add login" in result['feature'][0]
-    assert "fix(auth): handle token expiry" in result['fix'][0]
-    assert "chore: update deps" in result['chore'][0]
-    assert "docs: update API docs" in result['docs'][0]
-    assert "feat(ui): add dark mode" in result['feature'][1]
+    assert {group: len(result[group]) for group in counts} == counts
+    for subject, group, index in spot_checks:
+        assert subject in result[group][index]
 
 
 # ---------------------------------------------------------------------------
 # Helpers shared by generate_changelog_between_tags tests
 # ---------------------------------------------------------------------------
 
-class _FakeTagCommit:
-    def __init__(self, hexsha, committed_date, message="chore: placeholder"):
-        self.hexsha = hexsha
-        self.committed_date = committed_date
-        self.message = message
-
-
-class _FakeTagRef:
-    """Lightweight tag stand-in."""
-    def __init__(self, name, hexsha, committed_date, message="chore: placeholder"):
-        self.name = name
-        self.tag = None  # lightweight
-        self.commit = _FakeTagCommit(hexsha, committed_date, message)
-
-
-class _FakeAnnotatedTagRef(_FakeTagRef):
-    """Annotated tag stand-in."""
-    class _Ann:
-        def __init__(self, tagged_date):
-            self.tagged_date = tagged_date
-
-    def __init__(self, name, hexsha, committed_date, tagged_date, message="chore: placeholder"):
-        super().__init__(name, hexsha, committed_date, message)
-        self.tag = self._Ann(tagged_date)
+# Fake 40-character hexshas: a short prefix padded with _PAD33, or one repeated hex digit
+_PAD33 = "x" * 33
+_SHA_C, _SHA_D, _SHA_F = (c * 40 for c in "cdf")
 
 
 class _FakeCommit:
+    __slots__ = ("hexsha", "message")
+
     def __init__(self, hexsha, message):
         self.hexsha = hexsha
         self.message = message
 
 
-def _make_repo(tag_refs, commits_by_revision):
+def _make_repo(tag_names, commits_by_revision):
+    """Fake repo; tag_names are listed as `for-each-ref --sort=creatordate` prints them, oldest first."""
+    tag_listing = '\n'.join(tag_names)
+
     class _FakeGit:
-        def __init__(self, names):
-            self._names = names
-        def tag(self, *args):
-            if '--merged' in args:
-                return '\n'.join(self._names)
-            return ''
+        def for_each_ref(self, *args):
+            return tag_listing
+        def log(self, revision, *args):
+            if revision not in commits_by_revision:
+                raise Exception(f"Unknown revision: {revision}")
+            return _render_git_log(commits_by_revision[revision])
 
     class _FakeRepo:
         def __init__(self):
-            self.tags = tag_refs
-            self.git = _FakeGit([t.name for t in tag_refs])
-        def iter_commits(self, revision):
-            if revision not in commits_by_revision:
-                raise Exception(f"Unknown revision: {revision}")
-            return commits_by_revision[revision]
+            self.git = _FakeGit()
 
     return _FakeRepo()
 
@@ -415,10 +392,10 @@ def test_generate_changelog_between_tags_no_tags():
 
 
 def test_generate_changelog_between_tags_single_tag():
-    tag = _FakeTagRef("v1.0.0", "a" * 40, 1000)
+    tag = "v1.0.0"
     commits = [
-        _FakeCommit("abc1234" + "x" * 33, "feat: initial feature"),
-        _FakeCommit("def5678" + "x" * 33, "fix: early fix"),
+        _FakeCommit("abc1234" + _PAD33, "feat: initial feature"),
+        _FakeCommit("def5678" + _PAD33, "fix: early fix"),
     ]
     repo = _make_repo([tag], {"v1.0.0": commits})
     result = generate_changelog_between_tags(repo)
@@ -430,11 +407,11 @@ def test_generate_changelog_between_tags_single_tag():
 
 
 def test_generate_changelog_between_tags_two_tags():
-    tag_old = _FakeTagRef("v1.0.0", "a" * 40, 1000)
-    tag_new = _FakeTagRef("v1.1.0", "b" * 40, 2000)
+    tag_old = "v1.0.0"
+    tag_new = "v1.1.0"
     commits = [
-        _FakeCommit("c" * 40, "feat: new thing"),
-        _FakeCommit("d" * 40, "fix: patch issue"),
+        _FakeCommit(_SHA_C, "feat: new thing"),
+        _FakeCommit(_SHA_D, "fix: patch issue"),
     ]
     repo = _make_repo([tag_old, tag_new], {"v1.0.0..v1.1.0": commits})
     result = generate_changelog_between_tags(repo)
@@ -443,46 +420,91 @@ def test_generate_changelog_between_tags_two_tags():
     assert "patch issue" in result
 
 
-def test_generate_changelog_between_tags_sorts_by_date_not_name():
-    """v1.10.0 is newest by date even though v1.9.0 > v1.10.0 lexicographically."""
-    tag_v1_10 = _FakeTagRef("v1.10.0", "a" * 40, 3000)
-    tag_v1_9  = _FakeTagRef("v1.9.0",  "b" * 40, 2000)
-    tag_v1_0  = _FakeTagRef("v1.0.0",  "c" * 40, 1000)
-    commits = [_FakeCommit("e" * 40, "feat: ten")]
-    repo = _make_repo(
-        [tag_v1_10, tag_v1_9, tag_v1_0],
-        {"v1.9.0..v1.10.0": commits},
-    )
+def test_generate_changelog_between_tags_real_repo_orders_by_creatordate(tmp_path):
+    """Against real git, the newest tag by date wins and unmerged tags are ignored."""
+    repo = Repo.init(tmp_path)
+    repo.git.config('user.name', 'Test User')
+    repo.git.config('user.email', 'test@example.com')
+
+    def commit(message, date):
+        with repo.git.custom_environment(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date):
+            repo.git.commit('--allow-empty', '-m', message)
+
+    commit("feat: first", "2024-01-01T00:00:00")
+    repo.git.tag("v1.9.0")
+    commit("feat: ten", "2024-01-02T00:00:00")
+    repo.git.tag("v1.10.0")
+    repo.git.checkout('-b', 'side')
+    commit("feat: unmerged", "2024-01-03T00:00:00")
+    repo.git.tag("v2.0.0")
+    repo.git.checkout('-')
+
     result = generate_changelog_between_tags(repo)
     assert "## v1.10.0 -" in result
     assert "ten" in result
+    assert "first" not in result
+    assert "unmerged" not in result
+
+
+def test_generate_changelog_between_tags_real_repo_tag_named_like_a_directory(tmp_path):
+    """A tag that is also a path in the work tree is still read as a revision."""
+    repo = Repo.init(tmp_path)
+    repo.git.config('user.name', 'Test User')
+    repo.git.config('user.email', 'test@example.com')
+
+    (tmp_path / 'v1.0.0').mkdir()
+    (tmp_path / 'v1.0.0' / 'index.md').write_text('docs\n')
+    repo.git.add('v1.0.0')
+    repo.git.commit('-m', 'docs: versioned docs')
+    repo.git.tag('v1.0.0')
+
+    result = generate_changelog_between_tags(repo)
+    assert "## v1.0.0 -" in result
+    assert "versioned docs" in result
 
 
-def test_generate_changelog_between_tags_annotated_uses_tagged_date():
-    """Annotated tags are sorted by tagged_date, not commit committed_date."""
-    tag_old = _FakeAnnotatedTagRef("v2.0.0", "a" * 40, committed_date=5000, tagged_date=1000)
-    tag_new = _FakeAnnotatedTagRef("v2.1.0", "b" * 40, committed_date=4000, tagged_date=2000)
-    commits = [_FakeCommit("c" * 40, "chore: after tag")]
-    repo = _make_repo([tag_old, tag_new], {"v2.0.0..v2.1.0": commits})
+def test_generate_changelog_between_tags_real_repo_annotated_uses_tagger_date(tmp_path):
+    """Against real git, annotated tags are ordered by tagger date, not by their commit's date."""
+    repo = Repo.init(tmp_path)
+    repo.git.config('user.name', 'Test User')
+    repo.git.config('user.email', 'test@example.com')
+
+    def commit(message, date):
+        with repo.git.custom_environment(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date):
+            repo.git.commit('--allow-empty', '-m', message)
+
+    def annotated_tag(name, date):
+        with repo.git.custom_environment(GIT_COMMITTER_DATE=date):
+            repo.git.tag('-a', name, '-m', name)
+
+    # The newer commit carries the older commit date, and v1.9.0 sorts after
+    # v1.10.0 by name, so ordering by commit date or by name would pick v1.9.0
+    commit("feat: first", "2024-01-05T00:00:00")
+    annotated_tag("v1.9.0", "2024-02-01T00:00:00")
+    commit("feat: second", "2024-01-01T00:00:00")
+    annotated_tag("v1.10.0", "2024-02-02T00:00:00")
+
     result = generate_changelog_between_tags(repo)
-    assert "## v2.1.0 -" in result
+    assert "## v1.10.0 -" in result
+    assert "second" in result
+    assert "first" not in result
 
 
 def test_generate_changelog_between_tags_empty_range():
     """Same-commit tags produce an informative empty-range message."""
-    tag1 = _FakeTagRef("v1.0.0", "a" * 40, 1000)
-    tag2 = _FakeTagRef("v1.0.1", "a" * 40, 2000)
+    tag1 = "v1.0.0"
+    tag2 = "v1.0.1"
     repo = _make_repo([tag1, tag2], {"v1.0.0..v1.0.1": []})
     result = generate_changelog_between_tags(repo)
     assert "No commits" in result
 
 
 def test_generate_changelog_between_tags_merge_commits_included():
-    tag_old = _FakeTagRef("v1.0.0", "a" * 40, 1000)
-    tag_new = _FakeTagRef("v1.1.0", "b" * 40, 2000)
+    tag_old = "v1.0.0"
+    tag_new = "v1.1.0"
     commits = [
-        _FakeCommit("f" * 40, "Merge pull request #42 from org/feature-x"),
-        _FakeCommit("c" * 40, "feat: actual feature"),
+        _FakeCommit(_SHA_F, "Merge pull request #42 from org/feature-x"),
+        _FakeCommit(_SHA_C, "feat: actual feature"),
     ]
     repo = _make_repo([tag_old, tag_new], {"v1.0.0..v1.1.0": commits})
     result = generate_changelog_between_tags(repo)
@@ -501,12 +523,11 @@ def test_get_commits_since_tag_uses_subject_line_only(tmp_path):
         "It can span multiple lines.\n"
     )
 
-    class MultilineRepo:
-        def iter_commits(self, rev):
-            return [type("C", (), {"hexsha": "abc1234" + "x" * 33, "message": multiline_message})()]
+    class MultilineRepo(_LogRepo):
+        def commits(self, rev):
+            return [type("C", (), {"hexsha": "abc1234" + _PAD33, "message": multiline_message})()]
 
     config = {"paths": {"changelog": str(tmp_path / "CHANGELOG.md")}}
-    from src.main import update_changelog
     update_changelog(config, "v1.0.0", MultilineRepo(), None)
 
     content = (tmp_path / "CHANGELOG.md").read_text()
@@ -517,8 +538,6 @@ def test_get_commits_since_tag_uses_subject_line_only(tmp_path):
 
 def test_extract_subject_strips_trailer_only_messages():
     """_extract_subject must return empty string when the subject IS a trailer."""
-    from src.main import _extract_subject
-
     assert _extract_subject("Signed-off-by: bot <bot@example.com>") == ""
     assert _extract_subject("Co-authored-by: user <user@example.com>") == ""
     assert _extract_subject("Reviewed-by: reviewer <r@example.com>") == ""
@@ -530,14 +549,12 @@ def test_extract_subject_strips_trailer_only_messages():
 
 def test_get_commits_skips_trailer_only_commits(tmp_path):
     """Commits whose entire message is a git trailer must be excluded from the changelog."""
-    from src.main import update_changelog
-
-    class MixedRepo:
-        def iter_commits(self, rev):
+    class MixedRepo(_LogRepo):
+        def commits(self, rev):
             return [
-                type("C", (), {"hexsha": "aaa1111" + "x" * 33, "message": "feat: real feature"})(),
-                type("C", (), {"hexsha": "bbb2222" + "x" * 33, "message": "Signed-off-by: bot <bot@example.com>"})(),
-                type("C", (), {"hexsha": "ccc3333" + "x" * 33, "message": "Co-authored-by: user <user@example.com>"})(),
+                type("C", (), {"hexsha": "aaa1111" + _PAD33, "message": "feat: real feature"})(),
+                type("C", (), {"hexsha": "bbb2222" + _PAD33, "message": "Signed-off-by: bot <bot@example.com>"})(),
+                type("C", (), {"hexsha": "ccc3333" + _PAD33, "message": "Co-authored-by: user <user@example.com>"})(),
             ]
 
     changelog = tmp_path / "CHANGELOG.md"
@@ -549,21 +566,20 @@ def test_get_commits_skips_trailer_only_commits(tmp_path):
     assert "Co-authored-by" not in content
 
 
-def test_update_changelog_passes_tag_last_to_iter_commits(tmp_path):
+def test_update_changelog_passes_tag_last_to_git_log(tmp_path):
     """update_changelog must pass tag_last as the revision boundary, not None."""
     revisions_seen = []
 
-    class TrackingRepo:
-        def iter_commits(self, rev):
+    class TrackingRepo(_LogRepo):
+        def commits(self, rev):
             revisions_seen.append(rev)
             return []
 
     config = {"paths": {"changelog": str(tmp_path / "CHANGELOG.md")}}
-    from src.main import update_changelog
     update_changelog(config, "v1.1.0", TrackingRepo(), "v1.0.0")
 
     assert revisions_seen == ["v1.0.0..HEAD"], (
-        f"Expected iter_commits called with 'v1.0.0..HEAD', got {revisions_seen}"
+        f"Expected git log called with 'v1.0.0..HEAD', got {revisions_seen}"
     )
 
 
@@ -577,8 +593,8 @@ def test_update_changelog_excludes_commits_before_tag_last(tmp_path):
         ("ccc3333", "feat: old feature before tag"),
     ]
 
-    class SelectiveRepo:
-        def iter_commits(self, rev):
+    class SelectiveRepo(_LogRepo):
+        def commits(self, rev):
             # Simulate correct git boundary: only return new commits when a
             # tag boundary is given; return everything when None / "HEAD".
             if rev == "v1.0.0..HEAD":
@@ -588,7 +604,6 @@ def test_update_changelog_excludes_commits_before_tag_last(tmp_path):
 
     changelog_file = tmp_path / "CHANGELOG.md"
     config = {"paths": {"changelog": str(changelog_file)}}
-    from src.main import update_changelog
     update_changelog(config, "v1.1.0", SelectiveRepo(), "v1.0.0")
 
     content = changelog_file.read_text()
@@ -601,13 +616,11 @@ def test_update_changelog_excludes_commits_before_tag_last(tmp_path):
 
 def test_pr_refs_are_linkified_when_repo_url_provided(tmp_path):
     """#N references in commit messages become markdown links when repo_url is given."""
-    from src.main import update_changelog
-
-    class PRRepo:
-        def iter_commits(self, rev):
+    class PRRepo(_LogRepo):
+        def commits(self, rev):
             return [
-                type("C", (), {"hexsha": "aaa1111" + "x" * 33, "message": "feat: add thing (#42)"})(),
-                type("C", (), {"hexsha": "bbb2222" + "x" * 33, "message": "fix: patch (#7)"})(),
+                type("C", (), {"hexsha": "aaa1111" + _PAD33, "message": "feat: add thing (#42)"})(),
+                type("C", (), {"hexsha": "bbb2222" + _PAD33, "message": "fix: patch (#7)"})(),
             ]
 
     config = {
@@ -623,11 +636,9 @@ def test_pr_refs_are_linkified_when_repo_url_provided(tmp_path):
 
 def test_pr_refs_not_linkified_without_repo(tmp_path):
     """#N references remain plain text when no repository is configured."""
-    from src.main import update_changelog
-
-    class PRRepo:
-        def iter_commits(self, rev):
-            return [type("C", (), {"hexsha": "aaa1111" + "x" * 33, "message": "feat: add thing (#42)"})()]
+    class PRRepo(_LogRepo):
+        def commits(self, rev):
+            return [type("C", (), {"hexsha": "aaa1111" + _PAD33, "message": "feat: add thing (#42)"})()]
 
     config = {
         "paths": {"changelog": str(tmp_path / "CHANGELOG.md")},
@@ -642,13 +653,12 @@ def test_pr_refs_not_linkified_without_repo(tmp_path):
 
 def test_generate_changelog_between_tags_output_format():
     """Output has version header and sections in correct order."""
-    import re
-    tag_old = _FakeTagRef("v3.0.0", "a" * 40, 1000)
-    tag_new = _FakeTagRef("v3.1.0", "b" * 40, 2000)
+    tag_old = "v3.0.0"
+    tag_new = "v3.1.0"
     commits = [
-        _FakeCommit("1234567" + "x" * 33, "feat: add new thing"),
-        _FakeCommit("abcdefg" + "x" * 33, "fix: patch issue"),
-        _FakeCommit("fedcbag" + "x" * 33, "chore: update deps"),
+        _FakeCommit("1234567" + _PAD33, "feat: add new thing"),
+        _FakeCommit("abcdefg" + _PAD33, "fix: patch issue"),
+        _FakeCommit("fedcbag" + _PAD33, "chore: update deps"),
     ]
     repo = _make_repo([tag_old, tag_new], {"v3.0.0..v3.1.0": commits})
     result = generate_changelog_between_tags(repo)
@@ -0,0 +1,85 @@
+"""Unit tests for configuration handling."""
+
+import logging
+import pytest
+
+from src.main import get_config
+
+
+@pytest.fixture
+def action_env(monkeypatch):
+    """Set the GitHub Action inputs get_config reads."""
+    env = {
+        "INPUT_INIT_VERSION": "0.0.0",
+        "INPUT_PRIMARY_BRANCH": "main",
+        "INPUT_TAG_PREFIX_CANDIDATE": "rc/",
+        "INPUT_TAG_PREFIX_RELEASE": "v",
+        "INPUT_GITHUB_TOKEN": "secret-token",
+        "INPUT_ENABLE_GIT_PUSH": "true",
+        "INPUT_ENABLE_GITHUB_RELEASE": "false",
+        "INPUT_AUTO_RELEASE_BRANCHES": "main,develop",
+        "INPUT_LOG_LEVEL": "DEBUG",
+        "GITHUB_REPOSITORY": "owner/repo",
+    }
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    return env
+
+
+def test_get_config_reads_inputs(action_env):
+    """Test that action inputs are mapped into the config dictionary"""
+    config = get_config()
+
+    assert config["init_version"] == "0.0.0"
+    assert config["primary_branch"] == "main"
+    assert config["tag_prefix"] == {"candidate": "rc/", "release": "v"}
+    assert config["github"]["repository"] == "owner/repo"
+    assert config["auto_release_branches"] == ["main", "develop"]
+    assert config["log_level"] == logging.DEBUG
+
+
+def test_get_config_masks_token_only_in_debug_log(action_env, caplog):
+    """Test that the token is masked in the debug log but kept in the config"""
+    with caplog.at_level(logging.DEBUG):
+        config = get_config()
+
+    assert config["github"]["token"] == "secret-token"
+    assert "secret-token" not in caplog.text
+    assert "xxx-masked-xxx" in caplog.text
+
+
+def test_get_config_skips_masked_view_above_debug(action_env, caplog):
+    """Test that no config dump is logged when DEBUG is disabled"""
+    with caplog.at_level(logging.INFO):
+        get_config()
+
+    assert "xxx-masked-xxx" not in caplog.text
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("true", True),
+    ("True", True),
+    (" TRUE ", True),
+    ("false", False),
+    ("yes", False),
+    (None, False),
+])
+def test_get_config_normalizes_feature_flags(action_env, monkeypatch, raw, expected):
+    """Test that feature inputs are parsed into booleans once"""
+    if raw is None:
+        monkeypatch.delenv("INPUT_ENABLE_GIT_PUSH")
+    else:
+        monkeypatch.setenv("INPUT_ENABLE_GIT_PUSH", raw)
+
+    config = get_config()
+
+    assert config["features"]["enable_git_push"] is expected
+    assert config["features"]["enable_github_release"] is False
+
+
+def test_get_config_returns_a_fresh_config_per_call(action_env):
+    """Test that mutating one returned config doesn't leak into the next call"""
+    config = get_config()
+    config["paths"]["changelog"] = "/elsewhere/CHANGELOG.md"
+
+    assert get_config()["paths"]["changelog"] == "CHANGELOG.md"
@@ -1,8 +1,9 @@
 """Unit tests for Git operations."""
 
 import os
+import copy
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch
 from git import Repo, GitCommandError
 import semver
 import subprocess
@@ -14,6 +15,13 @@ from src.main import (
     get_new_semver_version,
     create_release_branch,
     get_bump_type,
+    create_github_release,
+    actions_output,
+    get_latest_and_head_tags,
+    commit_release,
+    _github_session,
+    _parse_semver,
+    _keyword_message,
     git
 )
 
@@ -27,15 +35,15 @@ def mock_git():
 
 @pytest.fixture
 def mock_repo():
-    """Mock git repository."""
-    repo = MagicMock()
-    repo.git = MagicMock()
+    """Mock git repository exposing only the git commands the code under test runs."""
+    repo = Mock(spec_set=["git"])
+    repo.git = Mock(spec_set=["tag", "push", "checkout", "describe", "log"])
     return repo
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def basic_config():
-    """Fixture that provides basic configuration"""
+    """Fixture that provides basic configuration; shared by the module, so deep-copy it before mutating"""
     return {
         "init_version": "0.0.0",
         "primary_branch": "main",
@@ -44,9 +52,9 @@ def basic_config():
             "release": ""
         },
         "features": {
-            "enable_git_push": "true",
-            "enable_github_release": "true",
-            "enable_custom_branch": "true"
+            "enable_git_push": True,
+            "enable_github_release": True,
+            "enable_custom_branch": True
         },
         "keywords": {
             "patch_bump": ['[hotfix]', '[fix]', 'hotfix:', 'fix:'],
@@ -56,38 +64,58 @@ def basic_config():
 
 
 class TestGitTagOperations:
-    def test_git_create_and_push_tag_with_push_enabled(self, mock_repo, basic_config):
-        """Test tag creation and push when push is enabled"""
+    @pytest.mark.parametrize("enable_git_push, sha, tag_error, push_error", [
+        (True, None, None, None),
+        (False, None, None, None),
+        (True, "abc123", None, None),
+        (True, None, GitCommandError("tag", "Tag already exists"), None),
+        (True, None, None, GitCommandError("push", "Push failed")),
+    ], ids=["push_enabled", "push_disabled", "with_sha", "tag_failure", "push_failure"])
+    def test_git_create_and_push_tag(self, mock_repo, enable_git_push, sha, tag_error, push_error):
+        """Test tag creation on HEAD or a given SHA, the optional push, and error propagation"""
+        config = {"features": {"enable_git_push": enable_git_push}}
         tag = "v1.0.0"
+        mock_repo.git.tag.side_effect = tag_error
+        mock_repo.git.push.side_effect = push_error
+        args = (sha,) if sha else ()
 
-        git_create_and_push_tag(basic_config, mock_repo, tag)
+        if tag_error or push_error:
+            with pytest.raises(GitCommandError):
+                git_create_and_push_tag(config, mock_repo, tag, *args)
+        else:
+            git_create_and_push_tag(config, mock_repo, tag, *args)
 
         # Verify tag was created
-        mock_repo.git.tag.assert_called_once_with(tag, 'HEAD')
-        # Verify tag was pushed
-        mock_repo.git.push.assert_called_once_with(
-            '--tags', 'origin', f'refs/tags/{tag}')
+        mock_repo.git.tag.assert_called_once_with(tag, sha or 'HEAD')
+        # Verify tag was pushed only when enabled and tagging succeeded
+        if enable_git_push and not tag_error:
+            mock_repo.git.push.assert_called_once_with(
+                '--tags', 'origin', f'refs/tags/{tag}')
+        else:
+            mock_repo.git.push.assert_not_called()
 
-    def test_git_create_and_push_tag_with_push_disabled(self, mock_repo, basic_config):
-        """Test tag creation without push when push is disabled"""
-        basic_config["features"]["enable_git_push"] = "false"
-        tag = "v1.0.0"
 
-        git_create_and_push_tag(basic_config, mock_repo, tag)
+class TestTagLookup:
+    def test_get_latest_and_head_tags_head_untagged(self, mock_repo):
+        """Test that a non-zero distance yields only the latest tag"""
+        mock_repo.git.describe.return_value = "release-1.2.0-3-gabc1234"
 
-        # Verify tag was created
-        mock_repo.git.tag.assert_called_once_with(tag, 'HEAD')
-        # Verify tag was not pushed
-        mock_repo.git.push.assert_not_called()
+        assert get_latest_and_head_tags(mock_repo) == ("release-1.2.0", None)
+        mock_repo.git.describe.assert_called_once_with(
+            '--tags', '--long', '--candidates=100', 'HEAD')
 
-    def test_git_create_and_push_tag_failure(self, mock_repo, basic_config):
-        """Test tag creation failure handling"""
-        tag = "v1.0.0"
-        mock_repo.git.tag.side_effect = GitCommandError(
-            "tag", "Failed to create tag")
+    def test_get_latest_and_head_tags_head_tagged(self, mock_repo):
+        """Test that a zero distance means HEAD carries the latest tag"""
+        mock_repo.git.describe.return_value = "rc/1.2.0-0-gabc1234"
+
+        assert get_latest_and_head_tags(mock_repo) == ("rc/1.2.0", "rc/1.2.0")
 
-        with pytest.raises(GitCommandError):
-            git_create_and_push_tag(basic_config, mock_repo, tag)
+    def test_get_latest_and_head_tags_no_tags(self, mock_repo):
+        """Test that a repository without tags yields no tags"""
+        mock_repo.git.describe.side_effect = GitCommandError(
+            "describe", "No names found")
+
+        assert get_latest_and_head_tags(mock_repo) == (None, None)
 
 
 class TestVersionManagement:
@@ -100,6 +128,32 @@ class TestVersionManagement:
         assert version.minor == 2
         assert version.patch == 3
 
+    def test_get_semver_version_strips_non_digit_prefix(self, basic_config):
+        """Test that any leading non-digit prefix is removed before parsing"""
+        version = get_semver_version(basic_config, "release-v10.0.1")
+
+        assert version.major == 10
+        assert version.minor == 0
+        assert version.patch == 1
+
+    def test_get_semver_version_is_memoized(self, basic_config):
+        """Test that tags differing only in prefix share one parsed version"""
+        assert get_semver_version(basic_config, "rc/1.2.3") is get_semver_version(basic_config, "v1.2.3")
+
+    @pytest.mark.parametrize("version", [
+        "0.0.0", "1.2.3", "10.20.30", "1.2.3-rc.1", "1.2.3+build.5", "1.2.3-rc.1+build.5",
+    ])
+    def test_parse_semver_matches_semver(self, version):
+        """Test that the fast path and the fallback agree with semver's own parser"""
+        assert _parse_semver(version) == semver.VersionInfo.parse(version)
+        assert str(_parse_semver(version)) == version
+
+    @pytest.mark.parametrize("version", ["01.2.3", "1.2", "1.2.3.4", "1.2.x", "1.2.\u0663", "1. 2.3", "1.2.+3"])
+    def test_parse_semver_rejects_what_semver_rejects(self, version):
+        """Test that invalid versions still raise ValueError"""
+        with pytest.raises(ValueError):
+            _parse_semver(version)
+
     def test_get_semver_version_from_initial(self, basic_config):
         """Test getting initial version when no tag exists"""
         version = get_semver_version(basic_config)
@@ -108,35 +162,16 @@ class TestVersionManagement:
         assert version.minor == 0
         assert version.patch == 0
 
-    def test_get_new_semver_version_patch(self, basic_config):
-        """Test patch version bump"""
-        current_version = semver.VersionInfo(1, 2, 3)
-        new_version = get_new_semver_version(
-            basic_config, str(current_version), 'patch')
-
-        assert new_version.major == 1
-        assert new_version.minor == 2
-        assert new_version.patch == 4
-
-    def test_get_new_semver_version_minor(self, basic_config):
-        """Test minor version bump"""
-        current_version = semver.VersionInfo(1, 2, 3)
-        new_version = get_new_semver_version(
-            basic_config, str(current_version), 'minor')
-
-        assert new_version.major == 1
-        assert new_version.minor == 3
-        assert new_version.patch == 0
+    @pytest.mark.parametrize("bump, expected", [
+        ('patch', (1, 2, 4)),
+        ('minor', (1, 3, 0)),
+        ('major', (2, 0, 0)),
+    ])
+    def test_get_new_semver_version(self, basic_config, bump, expected):
+        """Test patch, minor and major version bumps"""
+        new_version = get_new_semver_version(basic_config, "1.2.3", bump)
 
-    def test_get_new_semver_version_major(self, basic_config):
-        """Test major version bump"""
-        current_version = semver.VersionInfo(1, 2, 3)
-        new_version = get_new_semver_version(
-            basic_config, str(current_version), 'major')
-
-        assert new_version.major == 2
-        assert new_version.minor == 0
-        assert new_version.patch == 0
+        assert (new_version.major, new_version.minor, new_version.patch) == expected
 
 
 class TestBranchOperations:
@@ -154,10 +189,11 @@ class TestBranchOperations:
 
     def test_create_release_branch_without_push(self, mock_repo, basic_config):
         """Test release branch creation without push"""
-        basic_config["features"]["enable_git_push"] = "false"
+        config = copy.deepcopy(basic_config)
+        config["features"]["enable_git_push"] = False
         new_version = semver.VersionInfo(1, 2, 3)
 
-        create_release_branch(basic_config, mock_repo, new_version)
+        create_release_branch(config, mock_repo, new_version)
 
         # Verify branch was created
         mock_repo.git.checkout.assert_called_once_with('-b', 'release/1.2')
@@ -177,152 +213,236 @@ class TestBranchOperations:
         mock_repo.git.push.assert_not_called()
 
 
-class TestBumpTypeDetection:
-    def test_get_bump_type_major(self, basic_config):
-        """Test major version bump detection"""
-        commit_message = "feat! add new feature"
-        bump_type = get_bump_type(basic_config, commit_message)
-        assert bump_type == 'major'
+class TestGitHubRelease:
+    def test_create_github_release_reuses_session(self, mock_repo):
+        """Test that releases are posted through the shared keep-alive session"""
+        config = {
+            "github": {
+                "repository": "owner/repo",
+                "url": "https://api.github.com",
+                "token": "secret"
+            }
+        }
+        mock_repo.git.log.return_value = ""
+
+        with patch('src.main._github_session') as mock_session:
+            create_github_release(config, "v1.0.0", mock_repo, "v0.9.0")
+            create_github_release(config, "v1.1.0", mock_repo, "v1.0.0")
+
+        mock_session.assert_called_with("secret")
+        post = mock_session.return_value.post
+        assert post.call_count == 2
+        args, kwargs = post.call_args
+        assert args == ("https://api.github.com/repos/owner/repo/releases",)
+        assert kwargs["json"]["tag_name"] == "v1.1.0"
+
+    def test_create_github_release_uses_prebuilt_body(self, mock_repo):
+        """Test that passing the changelog entry skips re-reading the commit range"""
+        config = {
+            "github": {
+                "repository": "owner/repo",
+                "url": "https://api.github.com",
+                "token": "secret"
+            }
+        }
 
-    def test_get_bump_type_patch(self, basic_config):
-        """Test patch version bump detection"""
-        commit_message = "fix: bug fix"
-        bump_type = get_bump_type(basic_config, commit_message)
-        assert bump_type == 'patch'
+        with patch('src.main._github_session') as mock_session:
+            create_github_release(config, "v1.0.0", mock_repo, "v0.9.0", "## v1.0.0 - notes")
 
-    def test_get_bump_type_minor(self, basic_config):
-        """Test minor version bump detection (default)"""
-        commit_message = "feat: new feature"
-        bump_type = get_bump_type(basic_config, commit_message)
-        assert bump_type == 'minor'
+        mock_repo.git.log.assert_not_called()
+        _, kwargs = mock_session.return_value.post.call_args
+        assert kwargs["json"]["body"] == "## v1.0.0 - notes"
 
-    def test_get_bump_type_case_insensitive(self, basic_config):
-        """Test case-insensitive bump type detection"""
-        commit_message = "FIX: bug fix"
-        bump_type = get_bump_type(basic_config, commit_message)
-        assert bump_type == 'patch'
+    def test_github_session_does_not_retry_post(self):
+        """Test that a create-release POST is never re-sent after a gateway error"""
+        retry = _github_session("secret").get_adapter("https://api.github.com").max_retries
 
+        assert retry.is_retry("GET", 502)
+        assert not retry.is_retry("POST", 502)
 
-def test_git_success(mock_git):
-    """Test successful git command execution."""
-    mock_git.return_value = b"success"
-    result = git("status")
-    assert result == "success"
-    mock_git.assert_called_once_with(["git", "status"])
+    def test_github_session_is_shared_per_token(self):
+        """Test that one authorized session is built per token"""
+        session = _github_session("secret")
 
+        assert _github_session("secret") is session
+        assert session.headers["Authorization"] == "Bearer secret"
+        assert _github_session("other") is not session
 
-def test_git_failure(mock_git):
-    """Test git command failure."""
-    mock_git.side_effect = subprocess.CalledProcessError(1, "git status")
-    with pytest.raises(subprocess.CalledProcessError):
-        git("status")
 
+class TestActionsOutput:
+    def test_actions_output_appends_to_github_output(self, tmp_path, monkeypatch):
+        """Test that consecutive outputs are appended after the existing contents"""
+        output_file = tmp_path / "github_output"
+        output_file.write_text("existing=1\n")
+        monkeypatch.setenv("GITHUB_OUTPUT", str(output_file))
 
-def test_git_create_and_push_tag_success(mock_repo):
-    """Test successful tag creation and push."""
-    config = {
-        "features": {
-            "enable_git_push": "true"
-        }
-    }
-    tag = "v1.0.0"
+        actions_output("rc/1.2.3")
+        actions_output("sha/abc1234")
 
-    git_create_and_push_tag(config, mock_repo, tag)
+        assert output_file.read_text() == (
+            "existing=1\n"
+            "version=rc/1.2.3\nsafe_version=rc-1.2.3\n"
+            "version=sha/abc1234\nsafe_version=sha-abc1234\n"
+        )
 
-    mock_repo.git.tag.assert_called_once_with(tag, "HEAD")
-    mock_repo.git.push.assert_called_once_with(
-        '--tags', 'origin', f"refs/tags/{tag}")
+    def test_actions_output_follows_github_output_changes(self, tmp_path, monkeypatch):
+        """Test that each call writes to the current GITHUB_OUTPUT path"""
+        first, second = tmp_path / "first", tmp_path / "second"
 
+        monkeypatch.setenv("GITHUB_OUTPUT", str(first))
+        actions_output("1.0.0")
+        monkeypatch.setenv("GITHUB_OUTPUT", str(second))
+        actions_output("1.1.0")
 
-def test_git_create_and_push_tag_no_push(mock_repo):
-    """Test tag creation without push."""
-    config = {
-        "features": {
-            "enable_git_push": "false"
-        }
-    }
-    tag = "v1.0.0"
+        assert first.read_text() == "version=1.0.0\nsafe_version=1.0.0\n"
+        assert second.read_text() == "version=1.1.0\nsafe_version=1.1.0\n"
 
-    git_create_and_push_tag(config, mock_repo, tag)
+    def test_actions_output_without_github_output(self, monkeypatch):
+        """Test that nothing is written when GITHUB_OUTPUT is unset"""
+        monkeypatch.delenv("GITHUB_OUTPUT", raising=False)
 
-    mock_repo.git.tag.assert_called_once_with(tag, "HEAD")
-    mock_repo.git.push.assert_not_called()
+        actions_output("1.0.0")
 
 
-def test_git_create_and_push_tag_with_sha(mock_repo):
-    """Test tag creation with specific SHA."""
-    config = {
-        "features": {
-            "enable_git_push": "true"
-        }
-    }
-    tag = "v1.0.0"
-    sha = "abc123"
+class TestReleaseCommit:
+    @pytest.fixture
+    def release_repo(self, tmp_path, monkeypatch):
+        repo = Repo.init(tmp_path)
+        repo.git.config('user.name', 'Test User')
+        repo.git.config('user.email', 'test@example.com')
+        (tmp_path / "README.md").write_text("# Test\n")
+        repo.git.add("README.md")
+        repo.git.commit('-m', 'Initial commit')
+        monkeypatch.chdir(tmp_path)
+        return repo
 
-    git_create_and_push_tag(config, mock_repo, tag, sha)
+    @pytest.fixture
+    def release_config(self, basic_config):
+        config = copy.deepcopy(basic_config)
+        config["keywords"]["skip_ci"] = "[skip ci]"
+        config["paths"] = {"changelog": "CHANGELOG.md"}
+        return config
 
-    mock_repo.git.tag.assert_called_once_with(tag, sha)
-    mock_repo.git.push.assert_called_once_with(
-        '--tags', 'origin', f"refs/tags/{tag}")
+    def test_commit_release_adds_new_changelog(self, release_repo, release_config, tmp_path):
+        """Test that the first release commit picks up the still-untracked changelog"""
+        (tmp_path / "CHANGELOG.md").write_text("# Changelog\n")
 
+        sha = commit_release(release_config, release_repo, "v1.0.0")
 
-def test_git_create_and_push_tag_failure(mock_repo):
-    """Test tag creation failure."""
-    config = {
-        "features": {
-            "enable_git_push": "true"
-        }
-    }
-    tag = "v1.0.0"
-    mock_repo.git.tag.side_effect = GitCommandError(
-        "tag", "Tag already exists")
+        assert sha == release_repo.head.commit.hexsha
+        assert release_repo.head.commit.message == "chore(release): version v1.0.0 [skip ci]\n"
+        assert "CHANGELOG.md" in release_repo.head.commit.tree
+        assert not release_repo.is_dirty(untracked_files=True)
 
-    with pytest.raises(GitCommandError):
-        git_create_and_push_tag(config, mock_repo, tag)
+    def test_commit_release_commits_tracked_changes_only(self, release_repo, release_config, tmp_path):
+        """Test that tracked edits are committed while unrelated untracked files are left alone"""
+        (tmp_path / "CHANGELOG.md").write_text("# Changelog\n")
+        commit_release(release_config, release_repo, "v1.0.0")
+        (tmp_path / "CHANGELOG.md").write_text("# Changelog\n\n## v1.1.0\n")
+        (tmp_path / "build.log").write_text("artifact")
 
+        commit_release(release_config, release_repo, "v1.1.0")
+
+        assert release_repo.head.commit.tree["CHANGELOG.md"].data_stream.read().endswith(b"## v1.1.0\n")
+        assert "build.log" not in release_repo.head.commit.tree
+        assert release_repo.untracked_files == ["build.log"]
 
-def test_git_push_failure(mock_repo):
-    """Test tag push failure."""
-    config = {
-        "features": {
-            "enable_git_push": "true"
-        }
-    }
-    tag = "v1.0.0"
-    mock_repo.git.push.side_effect = GitCommandError("push", "Push failed")
 
-    with pytest.raises(GitCommandError):
-        git_create_and_push_tag(config, mock_repo, tag)
+class TestBumpTypeDetection:
+    @pytest.mark.parametrize("commit_message, expected", [
+        ("feat! add new feature", 'major'),
+        ("fix: bug fix", 'patch'),
+        ("FIX: bug fix", 'patch'),
+        ("feat: new feature", 'minor'),
+    ])
+    def test_get_bump_type(self, basic_config, commit_message, expected):
+        """Test major, patch (case-insensitive) and default minor bump detection"""
+        assert get_bump_type(basic_config, commit_message) == expected
+
+    @pytest.mark.parametrize("message, is_merge, expected", [
+        ("fix: typo\n\n[RELEASE] notes", False, "fix: typo"),
+        ("Merge pull request #7 from org/fix\n\nfix: typo\n\n* details", True,
+         "Merge pull request #7 from org/fix\nfix: typo"),
+        ("Merge branch 'feature'", True, "Merge branch 'feature'"),
+        ("", False, ""),
+    ], ids=["subject_only", "merge_pr_title", "merge_without_body", "empty"])
+    def test_keyword_message(self, message, is_merge, expected):
+        """Test that keywords are matched on the subject, plus the PR title of merge commits"""
+        assert _keyword_message(message, is_merge) == expected
+
+    def test_get_bump_type_keywords_are_literal(self, basic_config):
+        """Test that bracketed keywords are not treated as regex character classes"""
+        bump_type = get_bump_type(basic_config, "x: bump")
+        assert bump_type == 'minor'
+
+        bump_type = get_bump_type(basic_config, "[HOTFIX] crash on start")
+        assert bump_type == 'patch'
+
+    def test_get_bump_type_major_takes_precedence(self, basic_config):
+        """Test that a major keyword wins over a patch keyword in the same message"""
+        bump_type = get_bump_type(basic_config, "feat! drop legacy api, fix: callers")
+        assert bump_type == 'major'
+
+
+def test_git_success(mock_git):
+    """Test successful git command execution."""
+    mock_git.return_value = "success\n"
+    result = git("status")
+    assert result == "success"
+    mock_git.assert_called_once_with(["git", "status"], text=True, errors="replace", env=ANY)
+
+
+def test_git_disables_terminal_prompt(mock_git, monkeypatch):
+    """Test that git runs non-interactively while keeping the caller's environment."""
+    monkeypatch.setenv("GIT_FLOW_TEST_MARKER", "1")
+    mock_git.return_value = "success"
+    git("push")
+    env = mock_git.call_args.kwargs["env"]
+    assert env["GIT_TERMINAL_PROMPT"] == "0"
+    assert env["GIT_FLOW_TEST_MARKER"] == "1"
+
+
+def test_git_keeps_leading_whitespace(mock_git):
+    """Test that only trailing newlines are stripped from the output."""
+    mock_git.return_value = " M src/main.py\n?? new.txt\n"
+    assert git("status", "--short") == " M src/main.py\n?? new.txt"
+
+
+def test_git_failure(mock_git):
+    """Test git command failure."""
+    mock_git.side_effect = subprocess.CalledProcessError(1, "git status")
+    with pytest.raises(subprocess.CalledProcessError):
+        git("status")
 
 
 def test_git_command_with_multiple_args(mock_git):
     """Test git command with multiple arguments."""
-    mock_git.return_value = b"success"
+    mock_git.return_value = "success\n"
     result = git("commit", "-m", "test message")
     assert result == "success"
-    mock_git.assert_called_once_with(["git", "commit", "-m", "test message"])
+    mock_git.assert_called_once_with(["git", "commit", "-m", "test message"], text=True, errors="replace", env=ANY)
 
 
 def test_git_command_with_special_chars(mock_git):
     """Test git command with special characters in arguments."""
-    mock_git.return_value = b"success"
+    mock_git.return_value = "success\n"
     result = git("commit", "-m", "test message with spaces and @#$%")
     assert result == "success"
     mock_git.assert_called_once_with(
-        ["git", "commit", "-m", "test message with spaces and @#$%"])
+        ["git", "commit", "-m", "test message with spaces and @#$%"], text=True, errors="replace", env=ANY)
 
 
 def test_git_command_with_empty_args(mock_git):
     """Test git command with empty arguments."""
-    mock_git.return_value = b"success"
+    mock_git.return_value = "success\n"
     result = git("")
     assert result == "success"
-    mock_git.assert_called_once_with(["git", ""])
+    mock_git.assert_called_once_with(["git", ""], text=True, errors="replace", env=ANY)
 
 
 def test_git_command_with_none_args(mock_git):
     """Test git command with None arguments."""
-    mock_git.return_value = b"success"
+    mock_git.return_value = "success\n"
     # None is not a valid argument type
     with pytest.raises(TypeError, match="Git command arguments must be strings, got <class 'NoneType'>"):
         git(None)
@@ -330,6 +450,6 @@ def test_git_command_with_none_args(mock_git):
 
 def test_git_command_with_invalid_args(mock_git):
     """Test git command with invalid argument types."""
-    mock_git.return_value = b"success"
+    mock_git.return_value = "success\n"
     with pytest.raises(TypeError):
         git(123)  # Non-string argument